@@ -6,6 +6,142 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     news_api_key: str = ""
 
+    # "live" calls NewsAPI/RSS/OpenAI; "fake" uses offline deterministic stubs
+    provider_mode: str = "live"
+    # Fake provider latency (mean ms, jitter as a fraction of the mean) and failure rate
+    fake_seed: int = 0
+    fake_news_latency_ms: float = 300.0
+    fake_feed_latency_ms: float = 200.0
+    fake_llm_latency_ms: float = 800.0
+    fake_latency_jitter: float = 0.25
+    fake_error_rate: float = 0.0
+    fake_feed_items: int = 30
+
+    # Prediction catalog JSON file; empty uses the bundled app/data/predictions.json
+    predictions_catalog_path: str = ""
+
+    # Maximum number of in-flight requests per upstream provider
+    news_api_concurrency: int = 4
+    openai_concurrency: int = 4
+
+    # Combined NewsAPI retrieval: query length limit, page size and pages per
+    # combined query, minimum share of an item's terms an article must match,
+    # and how long one retrieval is reused across refresh jobs (seconds)
+    news_query_max_chars: int = 500
+    news_page_size: int = 100
+    news_max_pages: int = 1
+    retrieval_min_match: float = 0.34
+    news_retrieval_ttl: int = 600
+    # How long a failed or empty retrieval is reused before NewsAPI is asked again (seconds)
+    news_retrieval_failure_backoff: int = 60
+
+    # OpenAI quota (requests/tokens per minute) and retry policy for 429/5xx
+    openai_rpm: int = 3500
+    openai_tpm: int = 90000
+    openai_max_retries: int = 4
+    openai_backoff_base: float = 0.5
+    openai_backoff_max: float = 20.0
+
+    # Shared outbound HTTP connection pool
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_max_connections_per_host: int = 6
+    http_keepalive_expiry: float = 60.0
+    http_timeout: float = 10.0
+    # Hard per-feed deadline so one hanging RSS host cannot stall the others
+    rss_feed_timeout: float = 8.0
+    # Most new items read from one feed per refresh (bounds the first fetch of a long feed)
+    rss_max_items_per_feed: int = 200
+    # Stored RSS articles shown on the geopolitical page, newest first
+    geopolitical_max_articles: int = 90
+
+    # SQLite database shared by all worker processes
+    database_path: str = "data/tracker.sqlite3"
+
+    # Articles whose title+description SimHashes differ by at most this many
+    # bits are treated as copies of the same story (must be below 4)
+    near_duplicate_max_distance: int = 3
+
+    # Persistent cache for OpenAI results (seconds / entry count)
+    ai_cache_enabled: bool = True
+    ai_cache_path: str = "data/ai_cache.sqlite3"
+    ai_cache_ttl: int = 86400
+    ai_cache_max_entries: int = 5000
+
+    # Re-score a category/prediction even with unchanged evidence after this long (seconds)
+    evidence_max_age: int = 604800
+
+    # Alert rules clear only once values drop this many points below their trigger level
+    alert_hysteresis: float = 5.0
+    # Optional URL that receives each alert transition as a JSON POST, and its timeout (seconds)
+    alert_webhook_url: str = ""
+    alert_webhook_timeout: float = 10.0
+    # How often alert streams check for transitions recorded by other workers (seconds)
+    alert_poll_interval: float = 15.0
+
+    # How long CDNs may reuse (and then serve stale while revalidating) polled
+    # read endpoints, 0 for no CDN caching; browsers always revalidate (seconds).
+    # Also the smallest response body worth compressing (bytes)
+    http_cache_max_age: int = 30
+    http_cache_stale_while_revalidate: int = 300
+    compression_min_size: int = 1000
+
+    # How long finished analysis jobs stay available for replay (seconds)
+    job_retention_seconds: int = 3600
+    # How often a worker streaming a job started by another worker checks for new events (seconds)
+    job_poll_interval: float = 0.5
+    # Idle time after which job event streams send a keep-alive comment (seconds)
+    job_keepalive_interval: float = 15.0
+    # How often the worker running a job records that it is alive, and how long
+    # other workers wait without one before failing the job (seconds)
+    job_heartbeat_interval: float = 5.0
+    job_heartbeat_timeout: float = 30.0
+
+    # How often each worker writes its metric totals for /metrics to sum, and how
+    # long the totals of a worker that has exited keep counting (seconds)
+    metrics_flush_interval: float = 15.0
+    metrics_retention_seconds: int = 86400
+
+    # Rendered PDF reports kept in memory, keyed by a hash of their inputs
+    pdf_cache_max_entries: int = 8
+
+    # Local TF-IDF pre-filter in front of AI tagging (cosine similarity thresholds)
+    relevance_prefilter_enabled: bool = True
+    relevance_min_score: float = 0.08
+    relevance_pretag_score: float = 0.45
+    relevance_pretag_margin: float = 0.25
+
+    # Batch article tagging: estimated prompt tokens and articles per request
+    tag_batch_token_budget: int = 3000
+    tag_batch_max_items: int = 40
+    tag_article_max_chars: int = 1200
+
+    # Where refresh results are shared between worker processes: memory (this
+    # process only), sqlite (database_path) or redis (redis_url)
+    snapshot_backend: str = "sqlite"
+    # Redis server for snapshot_backend=redis; "memory://" is an in-process stand-in for tests
+    redis_url: str = "redis://localhost:6379/0"
+    # Lock file electing the single worker that runs background refreshes, and
+    # how often the other workers retry it (seconds)
+    leader_lock_path: str = "data/scheduler.lock"
+    leader_retry_interval: float = 15.0
+    # With no snapshot yet, followers poll for the leader's first one this often,
+    # for up to snapshot_wait_timeout, instead of refreshing themselves (seconds)
+    snapshot_poll_interval: float = 1.0
+    snapshot_wait_timeout: float = 120.0
+
+    # Background refresh (seconds); an interval of 0 disables the periodic job
+    scheduler_enabled: bool = True
+    geopolitical_refresh_interval: int = 900
+    progress_refresh_interval: int = 21600
+    predictions_refresh_interval: int = 21600
+    # Predictions rescored per scheduled refresh, rotating through the catalog so
+    # each one comes up every ceil(catalog size / batch) intervals; 0 rescores the
+    # whole catalog every time. Scoring everything stays available on demand.
+    predictions_refresh_batch: int = 100
+    # Snapshots older than this are served stale while a refresh runs
+    geopolitical_max_age: int = 1800
+
     class Config:
         env_file = ".env"
 
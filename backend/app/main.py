@@ -1,12 +1,85 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.routers import predictions, geopolitical, progress, reports, jobs, alerts, search
+from app.providers import get_llm_provider, close_providers
+from app.services import metrics
+from app.services.alerts import alert_engine
+from app.models.schemas import GeopoliticalFeed, PredictionList, ProgressList
+from app.services.http_client import init_http_client, close_http_client
+from app.services.leader import leader_lock, run_when_leader
+from app.services.prediction_service import score_scheduled_predictions
+from app.services.progress_service import analyze_all_categories
+from app.services.rss_service import build_geopolitical_feed
+from app.services.snapshots import snapshot_store
+from app.services.store import progress_store
+from app.services.scheduler import (
+    scheduler,
+    GEOPOLITICAL_JOB,
+    PROGRESS_JOB,
+    PREDICTIONS_JOB,
+)
+
+
+def register_refresh_jobs() -> None:
+    snapshot_store.register_model(GEOPOLITICAL_JOB, GeopoliticalFeed)
+    snapshot_store.register_model(PROGRESS_JOB, ProgressList)
+    snapshot_store.register_model(PREDICTIONS_JOB, PredictionList)
+    scheduler.register(
+        GEOPOLITICAL_JOB, build_geopolitical_feed, settings.geopolitical_refresh_interval
+    )
+    scheduler.register(
+        PROGRESS_JOB,
+        analyze_all_categories,
+        settings.progress_refresh_interval,
+        last_run=progress_store.last_analyzed_at,
+    )
+    scheduler.register(
+        PREDICTIONS_JOB, score_scheduled_predictions, settings.predictions_refresh_interval
+    )
+
+
+register_refresh_jobs()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_http_client()
+    get_llm_provider()
+    # Bring alert state in line with stored progress (e.g. after a rule change)
+    await alert_engine.sync_from_store()
+    election = None
+    if settings.scheduler_enabled:
+        # Every worker runs this; only the one holding the lock refreshes
+        scheduler.is_leader = False
+        election = asyncio.create_task(
+            run_when_leader(leader_lock, scheduler.start, settings.leader_retry_interval)
+        )
+    metrics_flush = asyncio.create_task(metrics.flush_periodically())
+    yield
+    metrics_flush.cancel()
+    await asyncio.gather(metrics_flush, return_exceptions=True)
+    # Keep this worker's final counts in the totals other workers report
+    await metrics.flush()
+    if election is not None:
+        election.cancel()
+        await asyncio.gather(election, return_exceptions=True)
+    await scheduler.stop()
+    leader_lock.release()
+    await close_providers()
+    await close_http_client()
 
-from app.routers import predictions, geopolitical, progress, reports
 
 app = FastAPI(
     title="Project 2025 Tracker API",
     description="API for tracking Project 2025 predictions and geopolitical events",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -17,12 +90,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(metrics.MetricsMiddleware)
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+# Brotli when available (falls back to gzip per client), else gzip; SSE is never buffered
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_fallback=True,
+        excluded_handlers=[r"^/api/jobs/[^/]+/events$", r"^/api/alerts/events$"],
+    )
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.compression_min_size)
+
 app.include_router(predictions.router, prefix="/api", tags=["predictions"])
 app.include_router(geopolitical.router, prefix="/api", tags=["geopolitical"])
 app.include_router(progress.router, prefix="/api", tags=["progress"])
 app.include_router(reports.router, prefix="/api", tags=["reports"])
+app.include_router(jobs.router, prefix="/api", tags=["jobs"])
+app.include_router(alerts.router, prefix="/api", tags=["alerts"])
+app.include_router(search.router, prefix="/api", tags=["search"])
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Metrics summed over all worker processes (others' as of their last flush)."""
+    return PlainTextResponse(
+        await asyncio.to_thread(metrics.render_all),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
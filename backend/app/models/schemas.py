@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
 class Prediction(BaseModel):
@@ -8,12 +8,19 @@ class Prediction(BaseModel):
     prediction: str
     result: str
     news_match: str
+    category: Optional[str] = None
 
 
 class PredictionList(BaseModel):
     predictions: List[Prediction]
 
 
+class PredictionPage(BaseModel):
+    # Full Prediction objects, or only the requested ``fields`` of each
+    predictions: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
 class ArticleLink(BaseModel):
     title: str
     url: str
@@ -30,9 +37,34 @@ class ProgressList(BaseModel):
     items: List[ProgressItem]
 
 
+class ProgressHistoryPoint(BaseModel):
+    timestamp: str
+    progress: float
+    samples: int
+
+
+class ProgressHistorySeries(BaseModel):
+    category: str
+    points: List[ProgressHistoryPoint]
+
+
+class ProgressHistory(BaseModel):
+    bucket: str
+    start: str
+    end: str
+    series: List[ProgressHistorySeries]
+
+
+class ActiveAlert(BaseModel):
+    rule: str
+    message: str
+    since: str
+
+
 class AlertStatus(BaseModel):
     triggered: bool
     reason: str
+    alerts: List[ActiveAlert] = []
 
 
 class GeopoliticalArticle(BaseModel):
@@ -47,6 +79,32 @@ class GeopoliticalFeed(BaseModel):
     articles: List[GeopoliticalArticle]
 
 
+class SearchResult(BaseModel):
+    id: str
+    title: str
+    description: str
+    url: str
+    source: str
+    published_at: Optional[str] = None
+    tag: Optional[str] = None
+    score: float
+    snippet: str
+
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchResult]
+    next_offset: Optional[int] = None
+
+
 class ScoreResponse(BaseModel):
     predictions: List[Prediction]
     message: str
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    completed_items: int
+    events_url: str
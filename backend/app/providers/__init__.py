@@ -0,0 +1,98 @@
+"""Upstream provider selection.
+
+PROVIDER_MODE=live talks to NewsAPI, the RSS hosts and OpenAI;
+PROVIDER_MODE=fake swaps in offline, deterministic stand-ins with
+configurable latency and error rates (for benchmarks and CI).
+"""
+from typing import Optional
+from app.config import settings
+from app.providers.base import (
+    Completion,
+    FeedProvider,
+    FeedResponse,
+    LLMProvider,
+    NewsProvider,
+    TransientProviderError,
+)
+
+_news: Optional[NewsProvider] = None
+_feeds: Optional[FeedProvider] = None
+_llm: Optional[LLMProvider] = None
+
+
+def _fake_profile(mean_ms: float, salt: int):
+    from app.providers.fake import LatencyProfile
+
+    return LatencyProfile(
+        mean_ms,
+        jitter=settings.fake_latency_jitter,
+        error_rate=settings.fake_error_rate,
+        seed=settings.fake_seed + salt,
+    )
+
+
+def get_news_provider() -> Optional[NewsProvider]:
+    """The news search provider, or None when live mode has no NEWS_API_KEY."""
+    global _news
+    if _news is None:
+        if settings.provider_mode == "fake":
+            from app.providers.fake import FakeNewsProvider
+
+            _news = FakeNewsProvider(_fake_profile(settings.fake_news_latency_ms, 1))
+        elif settings.news_api_key:
+            from app.providers.live import NewsAPIProvider
+
+            _news = NewsAPIProvider(settings.news_api_key)
+    return _news
+
+
+def get_feed_provider() -> FeedProvider:
+    global _feeds
+    if _feeds is None:
+        if settings.provider_mode == "fake":
+            from app.providers.fake import FakeFeedProvider
+
+            _feeds = FakeFeedProvider(
+                _fake_profile(settings.fake_feed_latency_ms, 2), items=settings.fake_feed_items
+            )
+        else:
+            from app.providers.live import HTTPFeedProvider
+
+            _feeds = HTTPFeedProvider()
+    return _feeds
+
+
+def get_llm_provider() -> Optional[LLMProvider]:
+    """The shared LLM provider, or None when live mode has no OPENAI_API_KEY."""
+    global _llm
+    if _llm is None:
+        if settings.provider_mode == "fake":
+            from app.providers.fake import FakeLLMProvider
+
+            _llm = FakeLLMProvider(_fake_profile(settings.fake_llm_latency_ms, 3))
+        elif settings.openai_api_key:
+            from app.providers.live import OpenAIProvider
+
+            _llm = OpenAIProvider(settings.openai_api_key)
+    return _llm
+
+
+async def close_providers() -> None:
+    global _news, _feeds, _llm
+    if _llm is not None:
+        await _llm.close()
+    _news = _feeds = _llm = None
+
+
+__all__ = [
+    "Completion",
+    "FeedProvider",
+    "FeedResponse",
+    "LLMProvider",
+    "NewsProvider",
+    "TransientProviderError",
+    "get_news_provider",
+    "get_feed_provider",
+    "get_llm_provider",
+    "close_providers",
+]
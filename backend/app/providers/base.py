@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+from typing import AsyncContextManager, AsyncIterator, Dict, List, Mapping, Optional, Protocol
+
+
+class TransientProviderError(Exception):
+    """A retryable upstream failure (rate limit, 5xx, dropped connection)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+async def _no_chunks() -> AsyncIterator[bytes]:
+    return
+    yield
+
+
+@dataclass
+class FeedResponse:
+    status_code: int
+    chunks: AsyncIterator[bytes] = field(default_factory=_no_chunks)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class Completion:
+    content: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class NewsProvider(Protocol):
+    async def search(self, query: str, page_size: int, page: int = 1) -> List[Dict]:
+        """Return one page of NewsAPI-shaped article dicts for a query."""
+        ...
+
+
+class FeedProvider(Protocol):
+    def stream(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> AsyncContextManager[FeedResponse]:
+        """Conditionally fetch a feed, exposing the body as it downloads.
+
+        Status 304 means unchanged. Leaving the context early abandons the
+        rest of the body.
+        """
+        ...
+
+
+class LLMProvider(Protocol):
+    async def complete(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> Completion:
+        """Run a chat completion; ``json_mode`` constrains the reply to a JSON object."""
+        ...
+
+    async def close(self) -> None:
+        ...
@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from contextlib import asynccontextmanager
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+from xml.sax.saxutils import escape
+from app.providers.base import Completion, FeedResponse, TransientProviderError
+
+AGENDA_TAGS = [
+    "Federal Agency Capture",
+    "Judicial Defiance",
+    "Suppression of Dissent",
+    "NATO Disengagement",
+    "Media Subversion",
+    "None",
+]
+STATUSES = ["Achieved", "InProgress", "Obstructed", "Not Started"]
+# Articles the fake news search finds for each (sub)query
+FAKE_RESULTS_PER_QUERY = 5
+# Feed bodies are served in slices, like a real streamed download
+FEED_CHUNK_SIZE = 4096
+
+# Headlines mixing on-topic and unrelated stories so the tagging pipeline has real work
+HEADLINES = [
+    ("Judge finds administration defied court order on deportation flights", "A federal judge said officials ignored an injunction and scheduled a contempt hearing."),
+    ("Inspectors general fired across federal agencies", "Career staff replaced by political appointees as agency workforce shrinks."),
+    ("NATO allies debate defense spending ahead of summit", "European members weigh troop commitments as Washington signals withdrawal."),
+    ("Police arrest protesters outside federal building", "Activists detained during demonstration as critics decry crackdown on dissent."),
+    ("Pentagon restricts press access for reporters", "Journalists say new media rules amount to censorship of the press corps."),
+    ("Earthquake strikes off the coast of Chile", "No tsunami warning was issued after the magnitude 6 quake."),
+    ("Central bank holds interest rates steady", "Markets were little changed after the announcement."),
+    ("Football club wins league title on final day", "Fans celebrated in the streets after the match."),
+]
+_JSON_FIELD = re.compile(r'\{"(\w+)":')
+_ARTICLE_LINE = re.compile(r"^\[\d+\]", re.MULTILINE)
+_EPOCH = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+
+
+def _stable_int(*parts) -> int:
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class LatencyProfile:
+    """Gaussian latency around a mean, plus a transient error rate, from a seeded RNG."""
+
+    def __init__(self, mean_ms: float, jitter: float, error_rate: float, seed: int):
+        self.mean_ms = mean_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    async def wait(self, operation: str) -> None:
+        delay_ms = max(0.0, self._rng.gauss(self.mean_ms, self.mean_ms * self.jitter))
+        await asyncio.sleep(delay_ms / 1000)
+        if self._rng.random() < self.error_rate:
+            raise TransientProviderError(f"Simulated {operation} failure", retry_after=0.0)
+
+
+class FakeNewsProvider:
+    """Deterministic NewsAPI stand-in: the same query always returns the same articles."""
+
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+
+    async def search(self, query: str, page_size: int, page: int = 1) -> List[Dict]:
+        await self.profile.wait("news search")
+        # "(a) OR (b)" queries return FAKE_RESULTS_PER_QUERY hits for each part, paged
+        parts = [part.strip("() ") for part in query.split(" OR ")]
+        hits = [(part, i) for i in range(FAKE_RESULTS_PER_QUERY) for part in parts]
+        articles = []
+        for part, i in hits[(page - 1) * page_size:page * page_size]:
+            key = _stable_int(part, i)
+            title, description = HEADLINES[key % len(HEADLINES)]
+            articles.append({
+                "source": {"id": None, "name": "Fake Wire"},
+                "title": f"{title} ({part} #{i})",
+                "description": description,
+                "url": f"https://news.fake.local/{key:x}",
+                "publishedAt": (_EPOCH + timedelta(hours=key % 500)).isoformat(),
+            })
+        return articles
+
+
+class FakeFeedProvider:
+    """Serves a fixed RSS document per URL and honours conditional requests."""
+
+    def __init__(self, profile: LatencyProfile, items: int):
+        self.profile = profile
+        self.items = items
+
+    def _document(self, url: str) -> bytes:
+        entries = []
+        for i in range(self.items):
+            key = _stable_int(url, i)
+            title, description = HEADLINES[key % len(HEADLINES)]
+            published = format_datetime(_EPOCH - timedelta(hours=i))
+            entries.append(
+                f"<item><title>{escape(title)} #{i}</title>"
+                f"<link>https://feeds.fake.local/{key:x}</link>"
+                f"<guid>{key:x}</guid>"
+                f"<description>{escape(description)}</description>"
+                f"<pubDate>{published}</pubDate></item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(url)}</title>{''.join(entries)}</channel></rss>"
+        ).encode("utf-8")
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> AsyncIterator[FeedResponse]:
+        await self.profile.wait("feed fetch")
+        content = self._document(url)
+        current_etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        if etag == current_etag:
+            yield FeedResponse(status_code=304, etag=etag)
+            return
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(content), FEED_CHUNK_SIZE):
+                yield content[start:start + FEED_CHUNK_SIZE]
+
+        yield FeedResponse(status_code=200, chunks=chunks(), etag=current_etag)
+
+
+class FakeLLMProvider:
+    """Answers the app's prompts with plausible, prompt-derived deterministic output."""
+
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+
+    async def complete(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> Completion:
+        await self.profile.wait("completion")
+        system, prompt = messages[0]["content"], messages[-1]["content"]
+        key = _stable_int(model, prompt)
+
+        # Prompts name the JSON field they expect, e.g. {"status": ...}
+        match = _JSON_FIELD.search(system)
+        field_name = match.group(1) if match else "category"
+        if field_name == "categories":
+            count = len(_ARTICLE_LINE.findall(prompt))
+            value = [AGENDA_TAGS[_stable_int(key, i) % len(AGENDA_TAGS)] for i in range(count)]
+        elif field_name == "progress":
+            value = key % 101
+        elif field_name == "status":
+            value = STATUSES[key % len(STATUSES)]
+        else:
+            value = AGENDA_TAGS[key % len(AGENDA_TAGS)]
+        content = json.dumps({field_name: value}) if json_mode else str(value)
+
+        return Completion(
+            content=content,
+            headers={
+                "x-ratelimit-remaining-requests": "10000",
+                "x-ratelimit-remaining-tokens": "1000000",
+            },
+            prompt_tokens=sum(len(m["content"]) for m in messages) // 4,
+            completion_tokens=len(content) // 4 + 1,
+        )
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,99 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+from openai import AsyncOpenAI
+from app.config import settings
+from app.providers.base import Completion, FeedResponse
+from app.services.http_client import get_http_client, host_slot
+
+NEWS_API_BASE_URL = "https://newsapi.org/v2/everything"
+
+
+class NewsAPIProvider:
+    """NewsAPI /v2/everything over the shared pooled HTTP client."""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    async def search(self, query: str, page_size: int, page: int = 1) -> List[Dict]:
+        params = {
+            "q": query,
+            "language": "en",
+            "sortBy": "relevancy",
+            "apiKey": self.api_key,
+            "pageSize": page_size,
+            "page": page,
+        }
+        client = get_http_client()
+        async with host_slot(NEWS_API_BASE_URL):
+            response = await client.get(NEWS_API_BASE_URL, params=params)
+        response.raise_for_status()
+        data = response.json()
+        if not data:
+            return []
+        return data.get("articles") or []
+
+
+class HTTPFeedProvider:
+    """Conditional GETs for RSS/Atom feeds over the shared pooled HTTP client."""
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> AsyncIterator[FeedResponse]:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        client = get_http_client()
+        async with host_slot(url):
+            async with client.stream(
+                "GET", url, headers=headers, timeout=settings.rss_feed_timeout
+            ) as response:
+                if response.status_code == 304:
+                    yield FeedResponse(status_code=304, etag=etag, last_modified=last_modified)
+                    return
+                response.raise_for_status()
+                yield FeedResponse(
+                    status_code=response.status_code,
+                    chunks=response.aiter_bytes(),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
+
+class OpenAIProvider:
+    """Chat completions through one shared AsyncOpenAI client."""
+
+    def __init__(self, api_key: str):
+        # Retries are handled by ai_service so they respect the rate limiter
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    async def complete(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> Completion:
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra,
+        )
+        response = raw.parse()
+        usage = response.usage
+        return Completion(
+            content=response.choices[0].message.content.strip(),
+            headers=raw.headers,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -0,0 +1,64 @@
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from app.models.schemas import ActiveAlert, AlertStatus
+from app.services.alerts import alert_engine
+from app.services.http_cache import cached_json, make_etag
+
+router = APIRouter()
+
+
+def _alert_status() -> AlertStatus:
+    _, active = alert_engine.status()
+    return AlertStatus(
+        triggered=bool(active),
+        reason=" | ".join(alert["message"] for alert in active),
+        alerts=[
+            ActiveAlert(
+                rule=alert["rule_id"],
+                message=alert["message"],
+                since=datetime.fromtimestamp(alert["at"], timezone.utc).isoformat(),
+            )
+            for alert in active
+        ],
+    )
+
+
+@router.get("/alerts", response_model=AlertStatus)
+async def get_alerts(request: Request):
+    """Get the emergency alert status: every alert rule that is currently triggered."""
+    last_seq, _ = alert_engine.status()
+    etag = make_etag("alerts", last_seq)
+    return cached_json(request, etag, _alert_status)
+
+
+@router.get("/alerts/events")
+async def stream_alert_events(last_event_id: Optional[str] = Header(None)):
+    """Push alert transitions as Server-Sent Events.
+
+    A "status" event with the current AlertStatus is sent first; each
+    transition then arrives as an "alert" event carrying the rule, its new
+    state and the updated status. Reconnecting clients resume after
+    ``Last-Event-ID``.
+    """
+    if last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+    else:
+        after = alert_engine.status()[0] or 0
+
+    async def event_stream():
+        yield f"event: status\ndata: {_alert_status().model_dump_json()}\n\n"
+        async for event in alert_engine.follow(after):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = {**event, "status": _alert_status().model_dump()}
+            yield f"id: {event['seq']}\nevent: alert\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,22 +1,21 @@
-from fastapi import APIRouter
-from app.models.schemas import GeopoliticalFeed, GeopoliticalArticle
-from app.services.rss_service import fetch_geopolitical_updates
+from fastapi import APIRouter, Request
+from app.config import settings
+from app.models.schemas import GeopoliticalFeed
+from app.services.http_cache import cached_json, make_etag
+from app.services.scheduler import scheduler, GEOPOLITICAL_JOB
 
 router = APIRouter()
 
 
 @router.get("/geopolitical", response_model=GeopoliticalFeed)
-async def get_geopolitical_feed():
+async def get_geopolitical_feed(request: Request):
     """Get tagged RSS articles from Reuters/BBC/AP."""
-    articles_data = fetch_geopolitical_updates()
-    articles = [
-        GeopoliticalArticle(
-            title=a["title"],
-            date=a["date"],
-            summary=a["summary"],
-            link=a["link"],
-            tags=a["tags"],
+    snapshot = await scheduler.get_snapshot(
+        GEOPOLITICAL_JOB, max_age=settings.geopolitical_max_age
+    )
+    if snapshot is None:
+        return cached_json(
+            request, make_etag(GEOPOLITICAL_JOB, "empty"), lambda: GeopoliticalFeed(articles=[])
         )
-        for a in articles_data
-    ]
-    return GeopoliticalFeed(articles=articles)
+    etag = make_etag(GEOPOLITICAL_JOB, snapshot.version, snapshot.updated_at)
+    return cached_json(request, etag, lambda: snapshot.data)
@@ -0,0 +1,99 @@
+import json
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.models.schemas import JobStatus
+from app.services.jobs import Job, job_manager
+from app.routers.predictions import prediction_filters
+from app.services.prediction_service import score_predictions, synced_catalog
+from app.services.progress_service import analyze_all_categories
+from app.services.scheduler import PROGRESS_JOB, PREDICTIONS_JOB
+from app.services.snapshots import snapshot_store
+
+router = APIRouter()
+
+
+def _job_status(job: Job, request: Request) -> JobStatus:
+    return JobStatus(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        completed_items=job.item_count,
+        events_url=str(request.url_for("stream_job_events", job_id=job.id)),
+    )
+
+
+async def _run_progress_analysis(job: Job) -> None:
+    result = await analyze_all_categories(
+        on_result=lambda item: job.emit("item", item.model_dump())
+    )
+    await snapshot_store.apublish(PROGRESS_JOB, result)
+
+
+def _prediction_scoring(ids: Optional[List[int]]):
+    async def run(job: Job) -> None:
+        result = await score_predictions(
+            ids, on_result=lambda prediction: job.emit("item", prediction.model_dump())
+        )
+        await snapshot_store.apublish(PREDICTIONS_JOB, result)
+
+    return run
+
+
+@router.post("/progress/analyze/jobs", response_model=JobStatus, status_code=202)
+async def start_progress_analysis_job(request: Request):
+    """Start progress analysis in the background and return its job id."""
+    return _job_status(await job_manager.start(PROGRESS_JOB, _run_progress_analysis), request)
+
+
+@router.post("/predictions/score/jobs", response_model=JobStatus, status_code=202)
+async def start_prediction_scoring_job(
+    request: Request, filters: Dict[str, Optional[str]] = Depends(prediction_filters)
+):
+    """Start prediction scoring in the background and return its job id.
+
+    The same filters as GET /predictions restrict scoring to a subset.
+    """
+    ids = (await synced_catalog()).ids_matching(filters) if any(filters.values()) else None
+    return _job_status(await job_manager.start(PREDICTIONS_JOB, _prediction_scoring(ids)), request)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, request: Request):
+    """Get the status of a background job."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job, request)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(None)):
+    """Stream job results as Server-Sent Events, one "item" event per finished result.
+
+    The stream ends with a "done" or "failed" event. Earlier events are
+    replayed first, so late subscribers see every item; reconnecting
+    clients resume after ``Last-Event-ID``. Idle streams get keep-alive
+    comments.
+    """
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+
+    async def event_stream():
+        async for event in job.follow(after):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield (
+                f"id: {event['id']}\n"
+                f"event: {event['event']}\n"
+                f"data: {json.dumps(event['data'])}\n\n"
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,66 +1,92 @@
-from typing import List
-from fastapi import APIRouter
-from app.models.schemas import Prediction, PredictionList, ScoreResponse
-from app.services.news_service import search_news
-from app.services.ai_service import score_prediction_status
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.models.schemas import Prediction, PredictionPage, ScoreResponse
+from app.services.http_cache import cached_json, make_etag
+from app.services.prediction_service import score_all_predictions, score_predictions, synced_catalog
+from app.services.scheduler import PREDICTIONS_JOB
+from app.services.snapshots import snapshot_store
 
 router = APIRouter()
 
-PREDICTIONS_DATA = [
-    {"timeframe": "Jan-Mar 2025", "prediction": "Executive Order 1: Streamline Federal Bureaucracy", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Jan-Mar 2025", "prediction": "Policy Change 1: Energy Deregulation", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Apr-Jun 2025", "prediction": "Judicial Appointment 1: Conservative Judge", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Apr-Jun 2025", "prediction": "Agency Restructuring 1: Department of Education changes", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Jul-Sep 2025", "prediction": "Legislative Push 1: Immigration Reform", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Jul-Sep 2025", "prediction": "Withdrawal from International Treaty", "result": "Not Started", "news_match": ""},
-    {"timeframe": "Oct-Dec 2025", "prediction": "Executive Order 2: Re-evaluating Environmental Regulations", "result": "Not Started", "news_match": ""},
-]
-
-
-def get_predictions() -> List[Prediction]:
-    return [
-        Prediction(
-            id=i,
-            timeframe=p["timeframe"],
-            prediction=p["prediction"],
-            result=p["result"],
-            news_match=p["news_match"],
-        )
-        for i, p in enumerate(PREDICTIONS_DATA)
-    ]
+MAX_PAGE_SIZE = 1000
 
 
-@router.get("/predictions", response_model=PredictionList)
-async def list_predictions():
-    """Get all predictions (unscored)."""
-    return PredictionList(predictions=get_predictions())
+def prediction_filters(
+    timeframe: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+) -> Dict[str, Optional[str]]:
+    """Catalog filters shared by listing and scoring; ``status`` filters on the result."""
+    return {"timeframe": timeframe, "result": status, "category": category}
 
 
-@router.post("/predictions/score", response_model=ScoreResponse)
-async def score_predictions():
-    """Fetch news and score all predictions via AI."""
-    scored_predictions = []
-
-    for i, pred in enumerate(PREDICTIONS_DATA):
-        prediction_text = pred["prediction"]
-        search_query = f"Project 2025 {prediction_text}"
-
-        news_summaries = search_news(search_query)
-        combined_news = "\n".join(news_summaries) if news_summaries else ""
-
-        new_status = score_prediction_status(prediction_text, combined_news)
-
-        scored_predictions.append(
-            Prediction(
-                id=i,
-                timeframe=pred["timeframe"],
-                prediction=prediction_text,
-                result=new_status,
-                news_match=combined_news,
-            )
+def _parse_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    if not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return int(cursor)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    if fields is None:
+        return None
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - set(Prediction.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
+
+
+@router.get("/predictions", response_model=PredictionPage)
+async def list_predictions(
+    request: Request,
+    filters: Dict[str, Optional[str]] = Depends(prediction_filters),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
+):
+    """List predictions with their latest scores, filtered and cursor-paginated.
+
+    Pass ``next_cursor`` from a page as ``cursor`` to get the next one.
+    """
+    after = _parse_cursor(cursor)
+    selected = _parse_fields(fields)
+
+    catalog = await synced_catalog()
+    snapshot = await snapshot_store.aget(PREDICTIONS_JOB)
+    version = (snapshot.version, snapshot.updated_at) if snapshot else ("unscored",)
+    etag = make_etag(PREDICTIONS_JOB, *version, sorted(request.query_params.multi_items()))
+
+    def build() -> PredictionPage:
+        page, next_id = catalog.query(filters, after=after, limit=limit)
+        return PredictionPage(
+            predictions=[p.model_dump(include=selected) for p in page],
+            next_cursor=str(next_id) if next_id is not None else None,
         )
 
+    return cached_json(request, etag, build)
+
+
+@router.post("/predictions/score", response_model=ScoreResponse)
+async def score_predictions_endpoint(
+    filters: Dict[str, Optional[str]] = Depends(prediction_filters),
+):
+    """Fetch news and score predictions via AI; filters restrict scoring to a subset.
+
+    Without filters the whole catalog is scored, unlike the scheduled
+    refresh, which rescores one slice of it per interval.
+    """
+    if not any(filters.values()):
+        result = await score_all_predictions()
+        await snapshot_store.apublish(PREDICTIONS_JOB, result)
+        return ScoreResponse(predictions=result.predictions, message="Scoring complete")
+
+    catalog = await synced_catalog()
+    ids = catalog.ids_matching(filters)
+    result = await score_predictions(ids)
+    await snapshot_store.apublish(PREDICTIONS_JOB, result)
     return ScoreResponse(
-        predictions=scored_predictions,
-        message="Scoring complete",
+        predictions=catalog.get_many(ids),
+        message=f"Scored {len(ids)} predictions",
     )
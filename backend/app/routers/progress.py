@@ -1,100 +1,70 @@
-from datetime import date
-from fastapi import APIRouter
-from app.models.schemas import ProgressList, ProgressItem, AlertStatus, ArticleLink
-from app.services.news_service import search_news_with_links
-from app.services.ai_service import analyze_category_progress, AGENDA_CATEGORIES
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from app.models.schemas import (
+    ProgressList,
+    ProgressHistory,
+    ProgressHistoryPoint,
+    ProgressHistorySeries,
+)
+from app.services.ai_service import AGENDA_CATEGORIES
+from app.services.http_cache import cached_json, make_etag
+from app.services.progress_service import build_progress_list
+from app.services.scheduler import scheduler, PROGRESS_JOB
+from app.services.store import progress_store
 
 router = APIRouter()
 
-# Store progress data in memory (in production, use a database)
-progress_store = {
-    "Federal Agency Capture": {"progress": 50, "last_updated": None, "articles": []},
-    "Judicial Defiance": {"progress": 50, "last_updated": None, "articles": []},
-    "Suppression of Dissent": {"progress": 50, "last_updated": None, "articles": []},
-    "NATO Disengagement": {"progress": 50, "last_updated": None, "articles": []},
-    "Media Subversion": {"progress": 50, "last_updated": None, "articles": []},
-}
-
-
-def get_current_date() -> str:
-    return date.today().isoformat()
+DEFAULT_HISTORY_DAYS = 365
 
 
 @router.get("/progress", response_model=ProgressList)
-async def get_progress():
+async def get_progress(request: Request):
     """Get progress percentages for 5 agenda categories."""
-    items = []
-    for category in AGENDA_CATEGORIES:
-        data = progress_store.get(category, {"progress": 50, "last_updated": None, "articles": []})
-        items.append(
-            ProgressItem(
-                title=category,
-                progress=data["progress"],
-                last_updated=data["last_updated"] or "Not analyzed yet",
-                articles=[ArticleLink(**a) for a in data.get("articles", [])],
-            )
+    # The store only changes when a full analysis run is swapped in
+    etag = make_etag(PROGRESS_JOB, progress_store.last_analyzed_at())
+    return cached_json(request, etag, build_progress_list)
+
+
+@router.get("/progress/history", response_model=ProgressHistory)
+async def get_progress_history(
+    category: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    bucket: Literal["raw", "daily", "weekly"] = Query("daily"),
+):
+    """Get the progress time series per category, downsampled into daily or weekly buckets."""
+    if category is not None and category not in AGENDA_CATEGORIES:
+        raise HTTPException(status_code=404, detail=f"Unknown category '{category}'")
+
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS)
+    start_ts = datetime.combine(start, time.min, tzinfo=timezone.utc).timestamp()
+    end_ts = datetime.combine(end, time.max, tzinfo=timezone.utc).timestamp()
+
+    categories = [category] if category else AGENDA_CATEGORIES
+    series = [
+        ProgressHistorySeries(
+            category=name,
+            points=[
+                ProgressHistoryPoint(
+                    timestamp=datetime.fromtimestamp(p["timestamp"], timezone.utc).isoformat(),
+                    progress=p["progress"],
+                    samples=p["samples"],
+                )
+                for p in progress_store.history(name, start_ts, end_ts, bucket)
+            ],
         )
-    return ProgressList(items=items)
+        for name in categories
+    ]
+    return ProgressHistory(
+        bucket=bucket, start=start.isoformat(), end=end.isoformat(), series=series
+    )
 
 
 @router.post("/progress/analyze", response_model=ProgressList)
 async def analyze_progress():
     """Fetch news and analyze progress for all categories using AI."""
-    current_date = get_current_date()
-
-    for category in AGENDA_CATEGORIES:
-        # Create search query for this category
-        search_queries = {
-            "Federal Agency Capture": "Trump federal agency firings appointments Schedule F",
-            "Judicial Defiance": "Trump court order defiance judicial ruling ignored",
-            "Suppression of Dissent": "Trump protesters arrests journalists detained free speech",
-            "NATO Disengagement": "Trump NATO alliance withdrawal Europe defense",
-            "Media Subversion": "Trump media fake news press freedom journalists",
-        }
-
-        query = search_queries.get(category, f"Trump administration {category}")
-        news_summaries, article_links = search_news_with_links(query, limit=2)
-        combined_news = "\n".join(news_summaries) if news_summaries else ""
-
-        if combined_news:
-            progress = analyze_category_progress(category, combined_news)
-        else:
-            # Keep existing progress if no news found
-            progress = progress_store[category]["progress"]
-
-        progress_store[category] = {
-            "progress": progress,
-            "last_updated": current_date,
-            "articles": article_links,
-        }
-
-    # Return updated progress
-    items = [
-        ProgressItem(
-            title=category,
-            progress=progress_store[category]["progress"],
-            last_updated=progress_store[category]["last_updated"],
-            articles=[ArticleLink(**a) for a in progress_store[category].get("articles", [])],
-        )
-        for category in AGENDA_CATEGORIES
-    ]
-    return ProgressList(items=items)
-
-
-@router.get("/alerts", response_model=AlertStatus)
-async def get_alerts():
-    """Get emergency alert status based on progress thresholds."""
-    reasons = []
-
-    for category, data in progress_store.items():
-        progress = data["progress"]
-        if category == "Federal Agency Capture" and progress >= 80:
-            reasons.append("Federal agency capture exceeds safe threshold.")
-        if category == "Judicial Defiance" and progress >= 70:
-            reasons.append("Unconstitutional judicial defiance observed.")
-        if category == "Suppression of Dissent" and progress >= 75:
-            reasons.append("Active suppression of dissent detected.")
+    snapshot = await scheduler.refresh_now(PROGRESS_JOB)
+    return snapshot.data if snapshot else build_progress_list()
 
-    if reasons:
-        return AlertStatus(triggered=True, reason=" | ".join(reasons))
-    return AlertStatus(triggered=False, reason="")
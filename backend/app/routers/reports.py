@@ -1,16 +1,23 @@
+import asyncio
 from fastapi import APIRouter
-from fastapi.responses import FileResponse
-from app.services.pdf_service import generate_pdf_report
-from app.services.rss_service import fetch_geopolitical_updates
-from app.routers.progress import progress_store
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.services.pdf_service import get_pdf_report
+from app.services.store import progress_store
+from app.services.scheduler import scheduler, GEOPOLITICAL_JOB
 
 router = APIRouter()
 
+PDF_CHUNK_SIZE = 64 * 1024
+
 
 @router.get("/report/pdf")
 async def download_pdf_report():
     """Download PDF report."""
-    events = fetch_geopolitical_updates()
+    snapshot = await scheduler.get_snapshot(
+        GEOPOLITICAL_JOB, max_age=settings.geopolitical_max_age
+    )
+    events = [a.model_dump() for a in snapshot.data.articles] if snapshot else []
 
     # Convert progress_store to list format for PDF
     progress_data = [
@@ -19,12 +26,21 @@ async def download_pdf_report():
             "progress": data["progress"],
             "last_updated": data["last_updated"] or "Not analyzed yet",
         }
-        for category, data in progress_store.items()
+        for category, data in progress_store.all().items()
     ]
 
-    pdf_path = generate_pdf_report(progress_data, events)
-    return FileResponse(
-        pdf_path,
+    digest, pdf_bytes = await asyncio.to_thread(get_pdf_report, progress_data, events)
+
+    def iter_chunks():
+        for offset in range(0, len(pdf_bytes), PDF_CHUNK_SIZE):
+            yield pdf_bytes[offset:offset + PDF_CHUNK_SIZE]
+
+    return StreamingResponse(
+        iter_chunks(),
         media_type="application/pdf",
-        filename="project2025_report.pdf",
+        headers={
+            "Content-Disposition": 'attachment; filename="project2025_report.pdf"',
+            "Content-Length": str(len(pdf_bytes)),
+            "ETag": f'"{digest}"',
+        },
     )
@@ -0,0 +1,48 @@
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.models.schemas import SearchResult, SearchResults
+from app.services.articles import article_store
+from app.services.metrics import span
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 100
+
+
+@router.get("/search", response_model=SearchResults)
+async def search_articles(
+    q: str = Query(..., min_length=1, description="Words that must all appear in the article"),
+    tag: Optional[str] = None,
+    source: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+):
+    """Full-text search over every ingested article, ranked by BM25.
+
+    Filters on the article's tag, source name and publication date range
+    (inclusive). Pass ``next_offset`` as ``offset`` for the next page.
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    with span("search.query"):
+        # One extra row tells whether another page exists
+        rows = await asyncio.to_thread(
+            article_store.search,
+            q,
+            tag=tag,
+            source=source,
+            start=start.isoformat() if start else None,
+            end=(end + timedelta(days=1)).isoformat() if end else None,
+            limit=limit + 1,
+            offset=offset,
+        )
+    return SearchResults(
+        query=q,
+        results=[SearchResult(**row) for row in rows[:limit]],
+        next_offset=offset + limit if len(rows) > limit else None,
+    )
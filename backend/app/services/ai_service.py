@@ -1,6 +1,19 @@
-from typing import Optional
-from openai import OpenAI
+import asyncio
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import openai
 from app.config import settings
+from app.providers import LLMProvider, TransientProviderError, get_llm_provider
+from app.services.cache import ResultCache, ai_cache
+from app.services.limits import openai_limiter
+from app.services.metrics import cache_requests, fallbacks, llm_retries, llm_tokens, span
+from app.services.rate_limit import ProviderRateLimiter
+
+OPENAI_MODEL = "gpt-3.5-turbo"
 
 AGENDA_CATEGORIES = [
     "Federal Agency Capture",
@@ -10,144 +23,424 @@ AGENDA_CATEGORIES = [
     "Media Subversion",
 ]
 
+CATEGORY_DESCRIPTIONS = {
+    "Federal Agency Capture": "the extent to which federal agencies have been taken over by political loyalists, career staff replaced, and agency independence compromised",
+    "Judicial Defiance": "instances where the executive branch has ignored, defied, or undermined court rulings and judicial independence",
+    "Suppression of Dissent": "actions to silence critics, restrict protests, target journalists, or intimidate opposition voices",
+    "NATO Disengagement": "steps to weaken NATO alliances, reduce commitments to allies, or align with adversarial nations",
+    "Media Subversion": "efforts to discredit mainstream media, promote state-aligned narratives, or control information flow",
+}
+
+PREDICTION_STATUSES = ("Achieved", "InProgress", "Obstructed", "Not Started")
+_CATEGORY_LOOKUP = {category.lower(): category for category in AGENDA_CATEGORIES}
+_CATEGORY_LIST = ", ".join(AGENDA_CATEGORIES)
+_STATUS_LOOKUP = {status.lower(): status for status in PREDICTION_STATUSES}
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_FIRST_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A prompt whose instructions are fixed at import time.
+
+    Everything static lives in the system message and only ``user_template``
+    is filled per call, so repeated calls share a long identical prefix
+    (which lets provider-side prompt caching apply). ``version`` hashes the
+    static text; it is part of the result-cache key, so editing a prompt
+    invalidates the results it produced and nothing else.
+    """
+
+    name: str
+    system: str
+    user_template: str
+    parse: Callable[[Dict], Any]
+    temperature: float
+    max_tokens: int
+    version: str = field(init=False)
+
+    def __post_init__(self):
+        digest = hashlib.sha256(
+            "\0".join((self.name, self.system, self.user_template)).encode("utf-8")
+        ).hexdigest()[:12]
+        object.__setattr__(self, "version", f"{self.name}@{digest}")
+
+    def messages(self, **values: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user_template.format(**values)},
+        ]
 
-def get_openai_client() -> Optional[OpenAI]:
-    if not settings.openai_api_key:
+
+def _load_json_object(content: str) -> Optional[Dict]:
+    """The JSON object in a response, tolerating stray text around it."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        match = _JSON_OBJECT.search(content)
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group())
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def _parse_status(data: Dict) -> Optional[str]:
+    return _STATUS_LOOKUP.get(str(data.get("status", "")).strip().lower())
+
+
+def _parse_progress(data: Dict) -> Optional[int]:
+    match = _FIRST_NUMBER.search(str(data.get("progress", "")))
+    if not match:
         return None
-    return OpenAI(api_key=settings.openai_api_key)
+    return min(100, max(0, round(float(match.group()))))  # Clamp between 0-100
 
 
-def score_prediction_status(prediction_text: str, news_summary: str) -> str:
-    """Score a prediction based on news summary using OpenAI."""
-    client = get_openai_client()
-    if not client:
-        print("ERROR: OpenAI API key not configured")
-        return "Not Started"
+def _parse_category(data: Dict) -> str:
+    return _CATEGORY_LOOKUP.get(str(data.get("category", "")).strip().lower(), "None")
 
-    if not news_summary:
-        return "Not Started"
 
-    prompt = f"""
-    You are an expert political analyst. Your task is to evaluate the status of a specific prediction based on recent news.
-    The status can be one of the following: "Achieved", "InProgress", "Obstructed", "Not Started".
+def _parse_categories(data: Dict) -> Optional[List[str]]:
+    categories = data.get("categories")
+    if not isinstance(categories, list):
+        return None
+    return [_CATEGORY_LOOKUP.get(str(c).strip().lower(), "None") for c in categories]
+
+
+STATUS_PROMPT = PromptTemplate(
+    name="prediction_status",
+    system=(
+        "You are an expert political analyst. Your task is to evaluate the status of a "
+        "specific prediction based on recent news.\n"
+        'The status is one of: "Achieved", "InProgress", "Obstructed", "Not Started".\n'
+        'Respond with a JSON object of the form {"status": "<status>"} and nothing else.'
+    ),
+    user_template='Prediction: "{prediction}"\n\nRecent News Summary: "{news}"',
+    parse=_parse_status,
+    temperature=0.0,
+    max_tokens=20,
+)
+
+TAG_PROMPT = PromptTemplate(
+    name="article_tag",
+    system=(
+        "You're a political analyst classifying news. "
+        f"Choose the ONE most relevant category from this list: {_CATEGORY_LIST}. "
+        'If none apply, use "None". '
+        'Respond with a JSON object of the form {"category": "<category>"} and nothing else.'
+    ),
+    user_template="Classify this article:\n{article}",
+    parse=_parse_category,
+    temperature=0.2,
+    max_tokens=25,
+)
+
+BATCH_TAG_PROMPT = PromptTemplate(
+    name="article_tags",
+    system=(
+        "You're a political analyst classifying news. "
+        "For EACH numbered article choose the ONE most relevant category from this list: "
+        f"{_CATEGORY_LIST}. "
+        'If none apply, use "None". '
+        'Respond with a JSON object of the form {"categories": ["<category>", ...]} '
+        "with one entry per article, in the same order as the articles."
+    ),
+    user_template="Classify these {count} articles:\n{articles}",
+    parse=_parse_categories,
+    temperature=0.2,
+    # Grows with the batch; see assign_tags_with_ai
+    max_tokens=20,
+)
+
+PROGRESS_PROMPT = PromptTemplate(
+    name="category_progress",
+    system=(
+        "You are an expert political analyst tracking authoritarian indicators in the "
+        "United States.\n"
+        "Given a category, its definition and recent news, estimate the progress toward "
+        "this authoritarian goal as a percentage from 0 to 100.\n"
+        "- 0% means no progress, situation is normal/healthy\n"
+        "- 25% means early warning signs\n"
+        "- 50% means significant concerning developments\n"
+        "- 75% means serious erosion of democratic norms\n"
+        "- 100% means complete authoritarian capture in this area\n"
+        'Respond with a JSON object of the form {"progress": <number 0-100>} and nothing else.'
+    ),
+    user_template="Category: {category}\nDefinition: {description}\n\nRecent News Summary:\n{news}",
+    parse=_parse_progress,
+    temperature=0.3,
+    max_tokens=15,
+)
+
+PROMPTS: Dict[str, PromptTemplate] = {
+    prompt.name: prompt
+    for prompt in (STATUS_PROMPT, TAG_PROMPT, BATCH_TAG_PROMPT, PROGRESS_PROMPT)
+}
+
+# Errors worth retrying: rate limits, provider 5xx and dropped connections
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+    TransientProviderError,
+)
+
+rate_limiter = ProviderRateLimiter(settings.openai_rpm, settings.openai_tpm)
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential backoff, honouring Retry-After when the provider sends it."""
+    if getattr(error, "retry_after", None) is not None:
+        return error.retry_after + random.uniform(0, 1)
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, 1)
+            except ValueError:
+                pass
+    ceiling = min(settings.openai_backoff_max, settings.openai_backoff_base * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+async def create_completion(
+    provider: LLMProvider,
+    messages: List[Dict],
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool = False,
+    prompt_version: Optional[str] = None,
+) -> str:
+    """Run a chat completion, serving byte-identical requests from the result cache.
+
+    Requests wait for request/token budget before being sent and retry with
+    jittered backoff on 429, 5xx and connection errors.
+    """
+    key = ResultCache.make_key(
+        OPENAI_MODEL,
+        messages,
+        temperature,
+        max_tokens=max_tokens,
+        json_mode=json_mode,
+        prompt_version=prompt_version,
+    )
+    # SQLite reads and writes run off the event loop, like the other stores
+    cached = await asyncio.to_thread(ai_cache.get, key)
+    if cached is not None:
+        cache_requests.inc("ai_result", "hit")
+        return cached
+    cache_requests.inc("ai_result", "miss")
+
+    estimated_tokens = sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+    attempt = 0
+    while True:
+        await rate_limiter.acquire(estimated_tokens)
+        try:
+            async with openai_limiter:
+                with span("llm.completion"):
+                    completion = await provider.complete(
+                        OPENAI_MODEL, messages, temperature, max_tokens, json_mode=json_mode
+                    )
+        except RETRYABLE_ERRORS as e:
+            response = getattr(e, "response", None)
+            if response is not None:
+                rate_limiter.update(response.headers)
+            if attempt >= settings.openai_max_retries:
+                print(f"ERROR: OpenAI request failed after {attempt + 1} attempts: {e}")
+                raise
+            llm_retries.inc(type(e).__name__)
+            delay = _retry_delay(attempt, e)
+            print(f"WARNING: OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
 
-    Prediction: "{prediction_text}"
+        rate_limiter.update(completion.headers)
+        if completion.prompt_tokens is not None:
+            llm_tokens.observe(completion.prompt_tokens, "prompt")
+        if completion.completion_tokens is not None:
+            llm_tokens.observe(completion.completion_tokens, "completion")
+        await asyncio.to_thread(ai_cache.set, key, completion.content)
+        return completion.content
 
-    Recent News Summary: "{news_summary}"
 
-    Based on the news, what is the most appropriate status for the prediction?
-    Return only one of the following words: Achieved, InProgress, Obstructed, Not Started.
+async def run_prompt(
+    provider: LLMProvider, prompt: PromptTemplate, max_tokens: Optional[int] = None, **values: str
+) -> Any:
+    """Fill a registered prompt, run it in JSON mode and parse the reply.
+
+    Returns the prompt's parsed value, or None if the reply is not a JSON
+    object of the expected shape. Provider errors propagate.
     """
+    content = await create_completion(
+        provider,
+        prompt.messages(**values),
+        temperature=prompt.temperature,
+        max_tokens=max_tokens or prompt.max_tokens,
+        json_mode=True,
+        prompt_version=prompt.version,
+    )
+    data = _load_json_object(content)
+    return prompt.parse(data) if data is not None else None
+
+
+async def score_prediction_status(prediction_text: str, news_summary: str) -> Optional[str]:
+    """Score a prediction based on news summary using OpenAI.
+
+    Returns None when there is no usable model answer, so callers can fall
+    back without mistaking the default for a real score.
+    """
+    provider = get_llm_provider()
+    if not provider:
+        print("ERROR: OpenAI API key not configured")
+        fallbacks.inc("score_prediction_status", "no_client")
+        return None
+
+    if not news_summary:
+        fallbacks.inc("score_prediction_status", "no_news")
+        return None
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a political analyst."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.0,
-            max_tokens=10,
+        result = await run_prompt(
+            provider, STATUS_PROMPT, prediction=prediction_text, news=news_summary
         )
-        result = response.choices[0].message.content.strip()
-        valid_results = ["Achieved", "InProgress", "Obstructed", "Not Started"]
-        if result in valid_results:
+        if result is not None:
             return result
-        print(f"AI returned invalid result: '{result}'. Defaulting to 'Not Started'.")
-        return "Not Started"
+        print("AI returned an invalid status.")
+        fallbacks.inc("score_prediction_status", "invalid_output")
+        return None
 
     except Exception as e:
         print(f"ERROR: Exception during OpenAI scoring: {e}")
-        return "Not Started"
+        fallbacks.inc("score_prediction_status", "error")
+        return None
 
 
-def assign_tag_with_ai(article_text: str) -> str:
-    """Classify an article into one of the agenda categories."""
-    client = get_openai_client()
-    if not client:
-        return "None"
+async def assign_tag_with_ai(article_text: str) -> Optional[str]:
+    """Classify an article into one of the agenda categories ("None" if it fits none).
 
-    system_prompt = (
-        "You're a political analyst classifying news. "
-        "Choose the ONE most relevant category from this list: "
-        "Federal Agency Capture, Judicial Defiance, Suppression of Dissent, "
-        "NATO Disengagement, Media Subversion. "
-        "If none apply, return 'None'. Only return the category name."
-    )
-    user_prompt = f"Classify this article:\n{article_text}"
+    Returns None when the model gave no usable answer, so the article can be
+    tagged again later.
+    """
+    provider = get_llm_provider()
+    if not provider:
+        fallbacks.inc("assign_tag_with_ai", "no_client")
+        return None
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.2,
-            max_tokens=20,
-        )
-        tag = response.choices[0].message.content.strip()
-        return tag if tag in AGENDA_CATEGORIES else "None"
+        tag = await run_prompt(provider, TAG_PROMPT, article=article_text)
+        if tag is None:
+            fallbacks.inc("assign_tag_with_ai", "invalid_output")
+        return tag
     except Exception as e:
         print(f"ERROR: Exception during AI tagging: {e}")
-        return "None"
+        fallbacks.inc("assign_tag_with_ai", "error")
+        return None
 
 
-def analyze_category_progress(category: str, news_summary: str) -> int:
-    """Analyze progress percentage for a category based on recent news."""
-    client = get_openai_client()
-    if not client:
-        print("ERROR: OpenAI API key not configured")
-        return 0
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for batch sizing."""
+    return len(text) // 4 + 1
 
-    if not news_summary:
-        return 0
 
-    category_descriptions = {
-        "Federal Agency Capture": "the extent to which federal agencies have been taken over by political loyalists, career staff replaced, and agency independence compromised",
-        "Judicial Defiance": "instances where the executive branch has ignored, defied, or undermined court rulings and judicial independence",
-        "Suppression of Dissent": "actions to silence critics, restrict protests, target journalists, or intimidate opposition voices",
-        "NATO Disengagement": "steps to weaken NATO alliances, reduce commitments to allies, or align with adversarial nations",
-        "Media Subversion": "efforts to discredit mainstream media, promote state-aligned narratives, or control information flow",
-    }
+def split_into_batches(texts: List[str], token_budget: int, max_items: int) -> List[List[int]]:
+    """Group text indices into batches whose estimated size fits the token budget."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def assign_tags_with_ai(article_texts: List[str]) -> List[Optional[str]]:
+    """Classify many articles with one chat completion per token-budgeted batch.
+
+    Articles the model could not classify (errors, unusable output) get None.
+    """
+    if not article_texts:
+        return []
+    provider = get_llm_provider()
+    if not provider:
+        fallbacks.inc("assign_tags_with_ai", "no_client")
+        return [None] * len(article_texts)
+
+    texts = [text[:settings.tag_article_max_chars] for text in article_texts]
+
+    async def tag_batch(batch: List[int]) -> List[Optional[str]]:
+        numbered = "\n\n".join(
+            f"[{n}] {texts[index]}" for n, index in enumerate(batch, start=1)
+        )
+        try:
+            batch_tags = await run_prompt(
+                provider,
+                BATCH_TAG_PROMPT,
+                max_tokens=12 * len(batch) + BATCH_TAG_PROMPT.max_tokens,
+                count=str(len(batch)),
+                articles=numbered,
+            )
+            if batch_tags is not None and len(batch_tags) != len(batch):
+                batch_tags = None
+        except Exception as e:
+            print(f"ERROR: Exception during batch AI tagging: {e}")
+            batch_tags = None
 
-    description = category_descriptions.get(category, category)
+        if batch_tags is None:
+            print(f"AI batch tagging failed for {len(batch)} articles. Tagging individually.")
+            fallbacks.inc("assign_tags_with_ai", "batch_unparsed")
+            batch_tags = await asyncio.gather(
+                *(assign_tag_with_ai(texts[index]) for index in batch)
+            )
+        return list(batch_tags)
 
-    prompt = f"""You are an expert political analyst tracking authoritarian indicators in the United States.
+    batches = split_into_batches(
+        texts, settings.tag_batch_token_budget, settings.tag_batch_max_items
+    )
+    results = await asyncio.gather(*(tag_batch(batch) for batch in batches))
+    tags: List[Optional[str]] = [None] * len(texts)
+    for batch, batch_tags in zip(batches, results):
+        for index, tag in zip(batch, batch_tags):
+            tags[index] = tag
+    return tags
 
-Category: {category}
-Definition: {description}
 
-Recent News Summary:
-{news_summary}
+async def analyze_category_progress(category: str, news_summary: str) -> Optional[int]:
+    """Analyze progress percentage for a category based on recent news.
 
-Based on the news above, estimate the progress toward this authoritarian goal as a percentage from 0 to 100.
-- 0% means no progress, situation is normal/healthy
-- 25% means early warning signs
-- 50% means significant concerning developments
-- 75% means serious erosion of democratic norms
-- 100% means complete authoritarian capture in this area
+    Returns None when there is no usable model answer.
+    """
+    provider = get_llm_provider()
+    if not provider:
+        print("ERROR: OpenAI API key not configured")
+        fallbacks.inc("analyze_category_progress", "no_client")
+        return None
 
-Return ONLY a number between 0 and 100, nothing else."""
+    if not news_summary:
+        fallbacks.inc("analyze_category_progress", "no_news")
+        return None
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a political analyst. Return only a number."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=10,
+        progress = await run_prompt(
+            provider,
+            PROGRESS_PROMPT,
+            category=category,
+            description=CATEGORY_DESCRIPTIONS.get(category, category),
+            news=news_summary,
         )
-        result = response.choices[0].message.content.strip()
-        # Extract number from response
-        import re
-        match = re.search(r'\d+', result)
-        if match:
-            progress = int(match.group())
-            return min(100, max(0, progress))  # Clamp between 0-100
-        return 0
+        if progress is not None:
+            return progress
+        fallbacks.inc("analyze_category_progress", "invalid_output")
+        return None
     except Exception as e:
         print(f"ERROR: Exception during progress analysis: {e}")
-        return 0
+        fallbacks.inc("analyze_category_progress", "error")
+        return None
@@ -0,0 +1,321 @@
+"""Declarative alert rules, evaluated when category progress changes.
+
+Rules are compiled once into conditions indexed by category, so an
+analysis run only re-evaluates the rules that read a category whose value
+moved, plus rules over a trailing window, whose baseline moves with time.
+A window's baseline is the low median of its samples, so one bad sample
+cannot fake a rise. An active rule clears only after its values fall
+``hysteresis`` points below the trigger level, which keeps borderline
+scores from flapping. Each transition is appended to the ``alert_events``
+log, posted to the webhook sink and pushed to SSE subscribers; workers
+that did not run the analysis pick new events up from the shared log.
+"""
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.services.ai_service import AGENDA_CATEGORIES
+from app.services.database import Database
+from app.services.http_client import get_http_client
+from app.services.metrics import alert_transitions
+from app.services.store import DAY_SECONDS, progress_store
+
+ALERT_TRIGGERED = "triggered"
+ALERT_CLEARED = "cleared"
+
+# Each rule fires when all of its conditions hold. A condition is a level
+# ("at_least") and/or a rise over a trailing window ("rises_by" points
+# within "within_days"), on one category's progress.
+ALERT_RULES = [
+    {
+        "id": "federal_agency_capture",
+        "message": "Federal agency capture exceeds safe threshold.",
+        "when": [{"category": "Federal Agency Capture", "at_least": 80}],
+    },
+    {
+        "id": "judicial_defiance",
+        "message": "Unconstitutional judicial defiance observed.",
+        "when": [{"category": "Judicial Defiance", "at_least": 70}],
+    },
+    {
+        "id": "suppression_of_dissent",
+        "message": "Active suppression of dissent detected.",
+        "when": [{"category": "Suppression of Dissent", "at_least": 75}],
+    },
+    {
+        "id": "dissent_crackdown_escalating",
+        "message": "Suppression of dissent rose sharply this week.",
+        "when": [{"category": "Suppression of Dissent", "rises_by": 15, "within_days": 7}],
+    },
+    {
+        "id": "press_and_courts_under_pressure",
+        "message": "Judicial defiance and media subversion are escalating together.",
+        "when": [
+            {"category": "Judicial Defiance", "at_least": 60},
+            {"category": "Media Subversion", "at_least": 60},
+        ],
+    },
+]
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS alert_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            rule_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            message TEXT NOT NULL,
+            observed TEXT NOT NULL DEFAULT '{}',
+            at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_alert_events_rule ON alert_events (rule_id, seq);
+        """
+    )
+
+
+@dataclass(frozen=True)
+class Condition:
+    category: str
+    at_least: Optional[float] = None
+    rises_by: Optional[float] = None
+    within_days: float = 7
+
+    def holds(self, value: float, baseline: Optional[float], margin: float) -> bool:
+        """Whether the condition is met; ``margin`` lowers the bar for an active rule."""
+        if self.at_least is not None and value < self.at_least - margin:
+            return False
+        if self.rises_by is not None:
+            if baseline is None or value - baseline < self.rises_by - margin:
+                return False
+        return True
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    id: str
+    message: str
+    conditions: Tuple[Condition, ...]
+
+    @property
+    def categories(self) -> Set[str]:
+        return {condition.category for condition in self.conditions}
+
+
+def compile_rules(specs: List[Dict]) -> List[AlertRule]:
+    """Validate rule specs and build rule objects; raises ValueError on a bad spec."""
+    rules = []
+    seen = set()
+    for spec in specs:
+        rule_id = spec["id"]
+        if rule_id in seen:
+            raise ValueError(f"Duplicate alert rule '{rule_id}'")
+        seen.add(rule_id)
+        conditions = []
+        for when in spec["when"]:
+            condition = Condition(**when)
+            if condition.category not in AGENDA_CATEGORIES:
+                raise ValueError(f"Alert rule '{rule_id}' uses unknown category '{condition.category}'")
+            if condition.at_least is None and condition.rises_by is None:
+                raise ValueError(f"Alert rule '{rule_id}' has a condition without a threshold")
+            conditions.append(condition)
+        if not conditions:
+            raise ValueError(f"Alert rule '{rule_id}' has no conditions")
+        rules.append(AlertRule(id=rule_id, message=spec["message"], conditions=tuple(conditions)))
+    return rules
+
+
+class AlertEngine:
+    """Keeps rule states in step with category progress and publishes transitions."""
+
+    def __init__(self, db: Database, rules: List[AlertRule], hysteresis: float):
+        self.db = db
+        self.rules = rules
+        self.hysteresis = hysteresis
+        self._by_category: Dict[str, List[AlertRule]] = {}
+        for rule in rules:
+            for category in rule.categories:
+                self._by_category.setdefault(category, []).append(rule)
+        # Rules over a trailing window can change state while their values stay flat
+        self._windowed = [
+            rule for rule in rules
+            if any(condition.rises_by is not None for condition in rule.conditions)
+        ]
+        # Last values evaluated by this process; None until the first ingest
+        self._values: Optional[Dict[str, float]] = None
+        self._changed = asyncio.Event()
+        self._deliveries: Set[asyncio.Task] = set()
+
+    def _active(self, conn) -> Dict[str, Dict]:
+        """Latest event per rule that is currently triggered."""
+        rows = conn.execute(
+            "SELECT seq, rule_id, state, message, at FROM alert_events "
+            "WHERE seq IN (SELECT MAX(seq) FROM alert_events GROUP BY rule_id)"
+        ).fetchall()
+        return {row["rule_id"]: dict(row) for row in rows if row["state"] == ALERT_TRIGGERED}
+
+    def _baseline(self, condition: Condition, now: float) -> Optional[float]:
+        """Typical progress over the condition's trailing window (includes the latest run).
+
+        The low median rather than the minimum: a single outlying sample
+        would otherwise become the baseline and read as a sharp rise.
+        """
+        points = progress_store.history(
+            condition.category, now - condition.within_days * DAY_SECONDS, now
+        )
+        if not points:
+            return None
+        return statistics.median_low(p["progress"] for p in points)
+
+    def _holds(self, rule: AlertRule, values: Dict[str, float], active: bool, now: float) -> bool:
+        margin = self.hysteresis if active else 0.0
+        return all(
+            condition.holds(
+                values[condition.category],
+                self._baseline(condition, now) if condition.rises_by is not None else None,
+                margin,
+            )
+            for condition in rule.conditions
+        )
+
+    async def ingest(self, values: Dict[str, float]) -> List[Dict]:
+        """Evaluate the rules affected by new category values; returns new transitions.
+
+        Call after progress is persisted, from the event loop that serves
+        subscribers. The SQLite work runs in a worker thread.
+        """
+        events = await asyncio.to_thread(self._evaluate, values)
+        for event in events:
+            alert_transitions.inc(event["rule"], event["state"])
+            self._deliver(event)
+        if events:
+            self._changed.set()
+            self._changed = asyncio.Event()
+        return events
+
+    def _evaluate(self, values: Dict[str, float]) -> List[Dict]:
+        """Check rules reading a changed category, plus every windowed rule."""
+        previous = self._values or {}
+        changed = {c for c, v in values.items() if previous.get(c) != v}
+        self._values = {**previous, **values}
+        rules = {rule.id: rule for c in changed for rule in self._by_category.get(c, [])}
+        rules.update((rule.id, rule) for rule in self._windowed)
+        if not rules:
+            return []
+
+        now = time.time()
+        current = {c: data["progress"] for c, data in progress_store.all().items()}
+        current.update(self._values)
+        conn = self.db.connection()
+        events = []
+        # The write lock makes check-and-append atomic across worker processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            active = self._active(conn)
+            for rule in rules.values():
+                was_active = rule.id in active
+                if self._holds(rule, current, was_active, now) == was_active:
+                    continue
+                state = ALERT_CLEARED if was_active else ALERT_TRIGGERED
+                observed = {c: current[c] for c in sorted(rule.categories)}
+                cursor = conn.execute(
+                    "INSERT INTO alert_events (rule_id, state, message, observed, at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (rule.id, state, rule.message, json.dumps(observed), now),
+                )
+                events.append({
+                    "seq": cursor.lastrowid,
+                    "rule": rule.id,
+                    "state": state,
+                    "message": rule.message,
+                    "observed": observed,
+                    "at": now,
+                })
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return events
+
+    async def sync_from_store(self) -> List[Dict]:
+        """Evaluate every rule against the persisted progress (e.g. at startup)."""
+        self._values = None
+        stored = await asyncio.to_thread(progress_store.all)
+        return await self.ingest({category: data["progress"] for category, data in stored.items()})
+
+    def status(self) -> Tuple[Optional[int], List[Dict]]:
+        """Last event sequence number and active alerts in rule order."""
+        conn = self.db.connection()
+        (last_seq,) = conn.execute("SELECT MAX(seq) FROM alert_events").fetchone()
+        active = self._active(conn)
+        return last_seq, [active[rule.id] for rule in self.rules if rule.id in active]
+
+    def events_after(self, seq: int) -> List[Dict]:
+        rows = self.db.connection().execute(
+            "SELECT seq, rule_id, state, message, observed, at FROM alert_events "
+            "WHERE seq > ? ORDER BY seq",
+            (seq,),
+        ).fetchall()
+        return [
+            {
+                "seq": row["seq"],
+                "rule": row["rule_id"],
+                "state": row["state"],
+                "message": row["message"],
+                "observed": json.loads(row["observed"]),
+                "at": row["at"],
+            }
+            for row in rows
+        ]
+
+    async def follow(self, after: int) -> AsyncIterator[Optional[Dict]]:
+        """Yield transitions with seq > ``after`` as they happen.
+
+        Transitions from this process wake followers at once; those written
+        by another worker are picked up within ``alert_poll_interval``. A
+        None is yielded after each idle interval so streams can send a
+        keep-alive.
+        """
+        while True:
+            waiter = self._changed
+            events = self.events_after(after)
+            for event in events:
+                yield event
+                after = event["seq"]
+            if events:
+                continue
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=settings.alert_poll_interval)
+            except asyncio.TimeoutError:
+                yield None
+
+    def _deliver(self, event: Dict) -> None:
+        if not settings.alert_webhook_url:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(_post_webhook(event))
+        except RuntimeError:
+            print("ERROR: Alert webhook skipped: no running event loop")
+            return
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+
+async def _post_webhook(event: Dict) -> None:
+    try:
+        response = await get_http_client().post(
+            settings.alert_webhook_url, json=event, timeout=settings.alert_webhook_timeout
+        )
+        response.raise_for_status()
+    except Exception as e:
+        print(f"ERROR: Alert webhook delivery failed for {event['rule']}: {e}")
+
+
+alert_engine = AlertEngine(
+    Database(settings.database_path, init_schema=_init_schema),
+    compile_rules(ALERT_RULES),
+    settings.alert_hysteresis,
+)
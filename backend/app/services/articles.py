@@ -0,0 +1,305 @@
+import hashlib
+import re
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from app.config import settings
+from app.services.database import Database
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+TRACKING_PARAMS = {"fbclid", "gclid", "ocid", "cmpid", "ref", "smid", "mc_cid", "mc_eid"}
+_WORD = re.compile(r"[a-z0-9]+")
+_SEARCH_TERM = re.compile(r"\w+")
+# BM25 column weights: a term in the title counts ten times one in the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Full-text index over original (non-duplicate) articles. It is external
+# content: rows live only in ``articles`` and triggers keep the index in step.
+_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE articles_fts USING fts5("
+    "title, description, content='articles', content_rowid='rowid', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles "
+    "WHEN new.duplicate_of IS NULL BEGIN "
+    "INSERT INTO articles_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles "
+    "WHEN old.duplicate_of IS NULL BEGIN "
+    "INSERT INTO articles_fts (articles_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER articles_fts_update AFTER UPDATE OF title, description ON articles "
+    "WHEN old.duplicate_of IS NULL BEGIN "
+    "INSERT INTO articles_fts (articles_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO articles_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    # Articles stored before the index existed
+    "INSERT INTO articles_fts (rowid, title, description) "
+    "SELECT rowid, title, description FROM articles WHERE duplicate_of IS NULL",
+]
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS articles (
+            id TEXT PRIMARY KEY,
+            canonical_url TEXT NOT NULL UNIQUE,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            source TEXT NOT NULL DEFAULT '',
+            published_at TEXT,
+            simhash INTEGER NOT NULL,
+            band0 INTEGER NOT NULL,
+            band1 INTEGER NOT NULL,
+            band2 INTEGER NOT NULL,
+            band3 INTEGER NOT NULL,
+            duplicate_of TEXT,
+            tag TEXT,
+            first_seen REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_band0 ON articles (band0);
+        CREATE INDEX IF NOT EXISTS idx_articles_band1 ON articles (band1);
+        CREATE INDEX IF NOT EXISTS idx_articles_band2 ON articles (band2);
+        CREATE INDEX IF NOT EXISTS idx_articles_band3 ON articles (band3);
+        CREATE INDEX IF NOT EXISTS idx_articles_source_published
+            ON articles (source, published_at);
+        """
+    )
+    # Checked and created under the write lock so only one worker backfills
+    conn.execute("BEGIN IMMEDIATE")
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone()
+    if not exists:
+        for statement in _FTS_SCHEMA:
+            conn.execute(statement)
+    conn.commit()
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so syndicated/tracked copies of a link compare equal."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def article_id(url: str) -> str:
+    """Short stable identifier for an article, derived from its canonical URL."""
+    return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()[:12]
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams."""
+    words = _WORD.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = _hash64(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word, immune to query syntax."""
+    return " ".join(f'"{term}"' for term in _SEARCH_TERM.findall(text))
+
+
+def _bands(value: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [value >> (band * BAND_BITS) & mask for band in range(SIMHASH_BANDS)]
+
+
+def _row_to_article(row) -> Dict:
+    return {
+        "id": row["id"],
+        "url": row["url"],
+        "title": row["title"],
+        "description": row["description"],
+        "source": row["source"],
+        "published_at": row["published_at"],
+        "tag": row["tag"],
+    }
+
+
+class ArticleStore:
+    """Articles keyed by canonical URL, with a banded SimHash near-duplicate index.
+
+    Any two hashes within ``max_distance`` bits (< number of bands) share at
+    least one 16-bit band exactly, so candidates come from indexed lookups.
+    """
+
+    def __init__(self, db: Database, max_distance: int):
+        self.db = db
+        self.max_distance = max_distance
+
+    def _find_near_duplicate(self, conn, value: int) -> Optional[Dict]:
+        bands = _bands(value)
+        rows = conn.execute(
+            "SELECT * FROM articles WHERE duplicate_of IS NULL AND "
+            "(band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?)",
+            bands,
+        ).fetchall()
+        for row in rows:
+            if bin((row["simhash"] & ((1 << 64) - 1)) ^ value).count("1") <= self.max_distance:
+                return row
+        return None
+
+    def _ingest(self, conn, article: Dict) -> Dict:
+        canonical_url = canonicalize_url(article["url"])
+        row = conn.execute(
+            "SELECT * FROM articles WHERE canonical_url = ?", (canonical_url,)
+        ).fetchone()
+        if row is not None:
+            if row["duplicate_of"]:
+                row = conn.execute(
+                    "SELECT * FROM articles WHERE id = ?", (row["duplicate_of"],)
+                ).fetchone()
+            return _row_to_article(row)
+
+        value = simhash(f"{article['title']} {article.get('description', '')}")
+        original = self._find_near_duplicate(conn, value) if value else None
+        new_id = article_id(article["url"])
+        conn.execute(
+            "INSERT INTO articles (id, canonical_url, url, title, description, source, "
+            "published_at, simhash, band0, band1, band2, band3, duplicate_of, first_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                new_id,
+                canonical_url,
+                article["url"],
+                article["title"],
+                article.get("description") or "",
+                article.get("source") or "",
+                article.get("published_at"),
+                _to_signed(value),
+                *_bands(value),
+                original["id"] if original is not None else None,
+                time.time(),
+            ),
+        )
+        if original is not None:
+            return _row_to_article(original)
+        return {
+            "id": new_id,
+            "url": article["url"],
+            "title": article["title"],
+            "description": article.get("description") or "",
+            "source": article.get("source") or "",
+            "published_at": article.get("published_at"),
+            "tag": None,
+        }
+
+    def ingest_many(self, articles: List[Dict]) -> List[Dict]:
+        """Store articles and return, for each input, its canonical (first-seen) record.
+
+        Inputs are dicts with url, title and optionally description, source
+        and published_at. Exact URL matches and near-duplicate stories both
+        resolve to the original article, including its tag if already set.
+        """
+        conn = self.db.connection()
+        with conn:
+            return [self._ingest(conn, article) for article in articles]
+
+    def recent(self, sources: List[str], limit: int) -> List[Dict]:
+        """Newest original (non-duplicate) articles from the given sources."""
+        if not sources:
+            return []
+        placeholders = ",".join("?" * len(sources))
+        rows = self.db.connection().execute(
+            f"SELECT * FROM articles WHERE source IN ({placeholders}) AND duplicate_of IS NULL "
+            "ORDER BY published_at DESC, first_seen DESC LIMIT ?",
+            (*sources, limit),
+        ).fetchall()
+        return [_row_to_article(row) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """Original articles matching every word of ``query``, best BM25 match first.
+
+        ``start`` and ``end`` bound published_at as ISO strings (end exclusive).
+        Each result also carries its ``score`` (lower is better, as in FTS5)
+        and a ``snippet`` of the description with matches in <mark> tags.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        clauses = ["articles_fts MATCH ?", "a.duplicate_of IS NULL"]
+        params: List = [match]
+        for clause, value in (
+            ("a.tag = ?", tag),
+            ("a.source = ?", source),
+            ("a.published_at >= ?", start),
+            ("a.published_at < ?", end),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        rows = self.db.connection().execute(
+            "SELECT a.*, bm25(articles_fts, ?, ?) AS score, "
+            "snippet(articles_fts, 1, '<mark>', '</mark>', '...', 24) AS snippet "
+            "FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY score LIMIT ? OFFSET ?",
+            (TITLE_WEIGHT, DESCRIPTION_WEIGHT, *params, limit, offset),
+        ).fetchall()
+        return [
+            {**_row_to_article(row), "score": row["score"], "snippet": row["snippet"]}
+            for row in rows
+        ]
+
+    def set_tags(self, tags: Dict[str, str]) -> None:
+        conn = self.db.connection()
+        with conn:
+            conn.executemany(
+                "UPDATE articles SET tag = ? WHERE id = ?",
+                [(tag, article_id) for article_id, tag in tags.items()],
+            )
+
+
+def unique_articles(records: List[Dict]) -> List[Dict]:
+    """Drop repeated canonical records while keeping the original order."""
+    seen = set()
+    unique = []
+    for record in records:
+        if record["id"] not in seen:
+            seen.add(record["id"])
+            unique.append(record)
+    return unique
+
+
+article_store = ArticleStore(
+    Database(settings.database_path, init_schema=_init_schema),
+    max_distance=settings.near_duplicate_max_distance,
+)
@@ -0,0 +1,115 @@
+import bisect
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.models.schemas import Prediction
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "predictions.json"
+)
+DEFAULT_STATUS = "Not Started"
+# Fields with an index; filters on them never scan the whole catalog
+INDEXED_FIELDS = ("timeframe", "result", "category")
+
+
+class PredictionCatalog:
+    """Predictions held in memory, ordered by id, with per-field id indexes.
+
+    Each index maps a field value to the ascending list of ids that have
+    it, so a filtered page is a bisect into the most selective list plus a
+    short scan. Models are built once and reused by every request.
+    """
+
+    def __init__(self, predictions: Iterable[Prediction]):
+        self._by_id: Dict[int, Prediction] = {}
+        self._ids: List[int] = []
+        self._index: Dict[str, Dict[Optional[str], List[int]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        self._synced: Optional[Tuple] = None
+        for prediction in sorted(predictions, key=lambda p: p.id):
+            self._by_id[prediction.id] = prediction
+            self._ids.append(prediction.id)
+            for field in INDEXED_FIELDS:
+                self._index[field].setdefault(getattr(prediction, field), []).append(prediction.id)
+
+    @classmethod
+    def load(cls, path: str) -> "PredictionCatalog":
+        """Read a JSON array of {id, timeframe, prediction, category} objects."""
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        return cls(
+            Prediction(
+                id=record["id"],
+                timeframe=record["timeframe"],
+                prediction=record["prediction"],
+                category=record.get("category"),
+                result=record.get("result", DEFAULT_STATUS),
+                news_match=record.get("news_match", ""),
+            )
+            for record in records
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def all(self) -> List[Prediction]:
+        return [self._by_id[pid] for pid in self._ids]
+
+    def get_many(self, ids: Iterable[int]) -> List[Prediction]:
+        return [self._by_id[pid] for pid in sorted(set(ids)) if pid in self._by_id]
+
+    def apply(self, scored: Iterable[Prediction]) -> None:
+        """Store new scores, moving changed ids between status index lists."""
+        for prediction in scored:
+            current = self._by_id.get(prediction.id)
+            if current is None:
+                continue
+            if current.result != prediction.result:
+                self._index["result"][current.result].remove(prediction.id)
+                bisect.insort(self._index["result"].setdefault(prediction.result, []), prediction.id)
+            self._by_id[prediction.id] = current.model_copy(
+                update={"result": prediction.result, "news_match": prediction.news_match}
+            )
+
+    def sync(self, marker: Tuple, scored: Iterable[Prediction]) -> None:
+        """Apply a published set of scores once per ``marker`` (e.g. a snapshot version)."""
+        if marker != self._synced:
+            self.apply(scored)
+            self._synced = marker
+
+    def query(
+        self,
+        filters: Dict[str, Optional[str]],
+        after: Optional[int] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Prediction], Optional[int]]:
+        """One page of predictions matching every filter, with ids greater than ``after``.
+
+        Returns the page and the cursor (last id) for the next page, or None
+        when this is the last page.
+        """
+        active = {field: value for field, value in filters.items() if value is not None}
+        candidates = self._ids
+        for field, value in active.items():
+            ids = self._index[field].get(value, [])
+            if len(ids) < len(candidates):
+                candidates = ids
+
+        page: List[Prediction] = []
+        start = bisect.bisect_right(candidates, after) if after is not None else 0
+        for position in range(start, len(candidates)):
+            prediction = self._by_id[candidates[position]]
+            if all(getattr(prediction, field) == value for field, value in active.items()):
+                if len(page) == limit:
+                    return page, page[-1].id
+                page.append(prediction)
+        return page, None
+
+    def ids_matching(self, filters: Dict[str, Optional[str]]) -> List[int]:
+        page, _ = self.query(filters, limit=len(self._ids))
+        return [prediction.id for prediction in page]
+
+
+prediction_catalog = PredictionCatalog.load(settings.predictions_catalog_path or DEFAULT_CATALOG_PATH)
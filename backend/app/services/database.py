@@ -0,0 +1,39 @@
+import os
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a SQLite connection in WAL mode so readers never block the writer."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class Database:
+    """Lazily opened, per-thread SQLite connections to one database file."""
+
+    def __init__(self, path: str, init_schema: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.path = path
+        self._init_schema = init_schema
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path)
+            with self._schema_lock:
+                if not self._schema_ready and self._init_schema is not None:
+                    self._init_schema(conn)
+                    conn.commit()
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
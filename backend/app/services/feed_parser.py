@@ -0,0 +1,110 @@
+"""Incremental RSS 2.0 / Atom parsing with flat memory use.
+
+Bytes are pushed into an ``XMLPullParser`` as they arrive and each item is
+normalized and discarded as soon as its closing tag is seen, so a feed with
+thousands of entries never exists as a whole document in memory.
+"""
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from xml.etree.ElementTree import Element, XMLPullParser
+
+ITEM_TAGS = {"item", "entry"}
+DATE_TAGS = ("pubDate", "published", "updated", "date")
+SUMMARY_TAGS = ("description", "summary", "content")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) timestamp into aware UTC."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def _normalize_item(element: Element) -> Dict:
+    fields: Dict[str, str] = {}
+    link = ""
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "link":
+            # Atom links carry the URL in href; prefer the alternate (HTML) link
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = href
+            elif child.text and not link:
+                link = child.text.strip()
+        elif child.text and name not in fields:
+            fields[name] = child.text.strip()
+
+    published = None
+    for name in DATE_TAGS:
+        published = parse_date(fields.get(name))
+        if published:
+            break
+    summary = next((fields[name] for name in SUMMARY_TAGS if name in fields), "")
+
+    return {
+        "title": fields.get("title", ""),
+        "link": link,
+        "guid": fields.get("guid") or fields.get("id") or link,
+        "summary": summary,
+        "published": published,
+        "date": published.strftime("%Y-%m-%d") if published else "N/A",
+    }
+
+
+class FeedReader:
+    """Push parser: feed it byte chunks, get back the items each chunk completed."""
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._open: List[Element] = []
+
+    def _drain(self) -> Iterator[Dict]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._open.append(element)
+                continue
+            self._open.pop()
+            if _local_name(element.tag) in ITEM_TAGS:
+                yield _normalize_item(element)
+                # Detach the finished item so the partial tree never grows
+                if self._open:
+                    self._open[-1].remove(element)
+                element.clear()
+
+    def feed(self, chunk: bytes) -> Iterator[Dict]:
+        self._parser.feed(chunk)
+        yield from self._drain()
+
+    def close(self) -> Iterator[Dict]:
+        self._parser.close()
+        yield from self._drain()
+
+
+async def iter_feed_items(chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict]:
+    """Yield normalized items from a streamed feed body, in document order.
+
+    Raises ``xml.etree.ElementTree.ParseError`` on malformed XML; items
+    yielded before the error are still valid.
+    """
+    reader = FeedReader()
+    async for chunk in chunks:
+        for item in reader.feed(chunk):
+            yield item
+    for item in reader.close():
+        yield item
@@ -0,0 +1,70 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.config import settings
+
+# Serialized bodies kept per ETag, so each data version is encoded once
+ENCODED_CACHE_MAX_ENTRIES = 32
+
+_encoded: "OrderedDict[str, bytes]" = OrderedDict()
+_encoded_lock = threading.Lock()
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag for a data version, e.g. a snapshot's name, version and timestamp."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 specifies for If-None-Match
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_headers(etag: str) -> dict:
+    """Validators plus caching rules: browsers revalidate on every use, CDNs may reuse.
+
+    Browsers get ``no-cache`` so a poll right after an analysis run sees
+    the new data (usually as a cheap 304) instead of a stale copy. The
+    shared-cache lifetime goes in ``CDN-Cache-Control`` (RFC 9213), which
+    browsers ignore; CDNs without support for it fall back to revalidating.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if settings.http_cache_max_age > 0:
+        headers["CDN-Cache-Control"] = (
+            f"public, s-maxage={settings.http_cache_max_age}, "
+            f"stale-while-revalidate={settings.http_cache_stale_while_revalidate}"
+        )
+    return headers
+
+
+def _encode(etag: str, build: Callable[[], BaseModel]) -> bytes:
+    with _encoded_lock:
+        body = _encoded.get(etag)
+        if body is not None:
+            _encoded.move_to_end(etag)
+            return body
+    body = build().model_dump_json().encode("utf-8")
+    with _encoded_lock:
+        _encoded[etag] = body
+        while len(_encoded) > ENCODED_CACHE_MAX_ENTRIES:
+            _encoded.popitem(last=False)
+    return body
+
+
+def cached_json(request: Request, etag: str, build: Callable[[], BaseModel]) -> Response:
+    """JSON response with validators: 304 when the client already has ``etag``.
+
+    ``build`` only runs the first time a given ETag is served.
+    """
+    headers = cache_headers(etag)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(_encode(etag, build), media_type="application/json", headers=headers)
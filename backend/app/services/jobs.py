@@ -0,0 +1,293 @@
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from app.config import settings
+from app.services.database import Database
+
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+# Events that end a job's stream. Not "error": EventSource clients reserve
+# that name for connection errors.
+DONE_EVENT = "done"
+FAILED_EVENT = "failed"
+TERMINAL_EVENTS = (DONE_EVENT, FAILED_EVENT)
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            item_count INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            finished_at REAL,
+            heartbeat_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs (finished_at);
+        CREATE TABLE IF NOT EXISTS job_events (
+            job_id TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (job_id, id)
+        );
+        """
+    )
+
+
+class JobStore:
+    """Jobs and their events in SQLite, so any worker process can serve them."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def create(self, job: "Job", prune_before: float) -> None:
+        """Record a new job and drop jobs that finished before ``prune_before``."""
+        conn = self.db.connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM job_events WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE finished_at < ?)",
+                (prune_before,),
+            )
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (prune_before,))
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created_at, heartbeat_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.kind, job.status, job.created_at, job.created_at),
+            )
+
+    def append(self, job: "Job", events: List[Dict]) -> None:
+        """Store new events along with the job's current status and item count."""
+        conn = self.db.connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_events (job_id, id, event, data) VALUES (?, ?, ?, ?)",
+                [(job.id, e["id"], e["event"], json.dumps(e["data"])) for e in events],
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, item_count = ?, finished_at = ?, heartbeat_at = ? "
+                "WHERE id = ?",
+                (job.status, job.item_count, job.finished_at, time.time(), job.id),
+            )
+
+    def heartbeat(self, job_id: str) -> None:
+        """Mark a running job's owner as alive."""
+        conn = self.db.connection()
+        with conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def abandon(self, job_id: str, silent_since: float) -> bool:
+        """Fail a running job whose owner has not checked in since ``silent_since``.
+
+        Appends the terminal event itself, so every follower sees the job
+        end; returns whether the job was abandoned.
+        """
+        conn = self.db.connection()
+        row = conn.execute(
+            "SELECT status, heartbeat_at FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None or row["status"] != JOB_RUNNING or row["heartbeat_at"] >= silent_since:
+            return False
+        with conn:
+            now = time.time()
+            # Re-checked under the write lock: the owner may have just finished
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? "
+                "WHERE id = ? AND status = ? AND heartbeat_at < ?",
+                (JOB_FAILED, now, job_id, JOB_RUNNING, silent_since),
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute(
+                "INSERT INTO job_events (job_id, id, event, data) "
+                "SELECT ?, COALESCE(MAX(id), -1) + 1, ?, ? FROM job_events WHERE job_id = ?",
+                (
+                    job_id,
+                    FAILED_EVENT,
+                    json.dumps({"status": JOB_FAILED, "detail": "The worker running this job stopped"}),
+                    job_id,
+                ),
+            )
+        return True
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        row = self.db.connection().execute(
+            "SELECT id, kind, status, item_count, created_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def events_after(self, job_id: str, after: int) -> List[Dict]:
+        rows = self.db.connection().execute(
+            "SELECT id, event, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+            (job_id, after),
+        ).fetchall()
+        return [{"id": row["id"], "event": row["event"], "data": json.loads(row["data"])} for row in rows]
+
+
+@dataclass
+class Job:
+    """A background analysis run whose events can be replayed and followed live.
+
+    The worker running the job keeps its events in memory and writes them to
+    the job store in the background, with a periodic heartbeat. Other
+    workers see a stored copy (``local`` is False) and follow it by polling
+    the store; they fail the job if its owner's heartbeat stops.
+    """
+
+    id: str
+    kind: str
+    status: str = JOB_RUNNING
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    item_count: int = 0
+    local: bool = True
+    events: List[Dict] = field(default_factory=list)
+    _store: Optional[JobStore] = field(default=None, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+    _unsaved: List[Dict] = field(default_factory=list, repr=False)
+    _saving: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status != JOB_RUNNING
+
+    def emit(self, event: str, data: Any) -> None:
+        record = {"id": len(self.events), "event": event, "data": data}
+        self.events.append(record)
+        if event == "item":
+            self.item_count += 1
+        # Wake current listeners and arm a fresh event for the next emit
+        self._changed.set()
+        self._changed = asyncio.Event()
+        if self._store is not None:
+            self._unsaved.append(record)
+            if self._saving is None or self._saving.done():
+                self._saving = asyncio.create_task(self._save())
+
+    async def _save(self) -> None:
+        while self._unsaved:
+            batch, self._unsaved = self._unsaved, []
+            try:
+                await asyncio.to_thread(self._store.append, self, batch)
+            except Exception as e:
+                print(f"ERROR: Failed to store events for job {self.id}: {e}")
+
+    async def saved(self) -> None:
+        """Wait until every emitted event has been written to the store."""
+        if self._saving is not None:
+            await self._saving
+
+    async def follow(self, after: int = -1) -> AsyncIterator[Optional[Dict]]:
+        """Yield events with id > ``after``, waiting for new ones until the job finishes.
+
+        A None is yielded after each ``job_keepalive_interval`` without
+        events, so streams can send a keep-alive.
+        """
+        if not self.local:
+            async for event in self._follow_stored(after):
+                yield event
+            return
+        index = after + 1
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=settings.job_keepalive_interval)
+            except asyncio.TimeoutError:
+                yield None
+
+    async def _follow_stored(self, after: int) -> AsyncIterator[Optional[Dict]]:
+        idle_since = time.monotonic()
+        while True:
+            events = await asyncio.to_thread(self._store.events_after, self.id, after)
+            for event in events:
+                yield event
+                after = event["id"]
+                idle_since = time.monotonic()
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+            if time.monotonic() - idle_since >= settings.job_keepalive_interval:
+                yield None
+                idle_since = time.monotonic()
+            if not events:
+                # A worker that died mid-job never writes its terminal event
+                silent_since = time.time() - settings.job_heartbeat_timeout
+                if await asyncio.to_thread(self._store.abandon, self.id, silent_since):
+                    continue
+            await asyncio.sleep(settings.job_poll_interval)
+
+
+class JobManager:
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._jobs: Dict[str, Job] = {}
+
+    def _prune(self) -> float:
+        cutoff = time.time() - settings.job_retention_seconds
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+        return cutoff
+
+    async def start(self, kind: str, runner: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Run ``runner(job)`` in the background; it emits "item" events as results land.
+
+        The job is stored before this returns, so every worker can serve it.
+        """
+        cutoff = self._prune()
+        job = Job(id=uuid.uuid4().hex, kind=kind, _store=self.store)
+        await asyncio.to_thread(self.store.create, job, cutoff)
+        self._jobs[job.id] = job
+
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(settings.job_heartbeat_interval)
+                try:
+                    await asyncio.to_thread(self.store.heartbeat, job.id)
+                except Exception as e:
+                    print(f"ERROR: Failed to record heartbeat for job {job.id}: {e}")
+
+        async def run() -> None:
+            beat = asyncio.create_task(heartbeat())
+            try:
+                await runner(job)
+                job.status = JOB_COMPLETED
+                job.finished_at = time.time()
+                job.emit(DONE_EVENT, {"status": job.status, "items": job.item_count})
+            except Exception as e:
+                print(f"ERROR: Job {job.id} ({kind}) failed: {e}")
+                job.status = JOB_FAILED
+                job.finished_at = time.time()
+                job.emit(FAILED_EVENT, {"status": job.status, "detail": str(e)})
+            finally:
+                beat.cancel()
+            await job.saved()
+
+        job._task = asyncio.create_task(run())
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """A job started by this worker, or the stored copy of one started elsewhere."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        row = await asyncio.to_thread(self.store.load, job_id)
+        if row is None:
+            return None
+        return Job(**row, local=False, _store=self.store)
+
+
+job_manager = JobManager(JobStore(Database(settings.database_path, init_schema=_init_schema)))
@@ -0,0 +1,66 @@
+import asyncio
+import os
+from typing import Callable, Optional
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so every process considers itself leader
+    fcntl = None
+
+
+class LeaderLock:
+    """Elects one worker process via a non-blocking exclusive lock on a file.
+
+    The OS drops the lock when the holding process exits, so a follower
+    retrying the lock takes over after the leader dies.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+
+async def run_when_leader(
+    lock: LeaderLock, on_elected: Callable[[], None], retry_interval: float
+) -> None:
+    """Call ``on_elected`` once this process holds the lock, retrying until it does."""
+    while not lock.try_acquire():
+        await asyncio.sleep(retry_interval)
+    print(f"INFO: Worker {os.getpid()} elected to run background refresh jobs")
+    on_elected()
+
+
+leader_lock = LeaderLock(settings.leader_lock_path)
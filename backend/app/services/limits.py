@@ -0,0 +1,7 @@
+import asyncio
+from app.config import settings
+
+# Per-provider concurrency limits shared by every router that fans out
+# upstream calls, so parallel runs never exceed the configured budget.
+news_api_limiter = asyncio.Semaphore(settings.news_api_concurrency)
+openai_limiter = asyncio.Semaphore(settings.openai_concurrency)
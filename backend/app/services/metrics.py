@@ -0,0 +1,317 @@
+"""Prometheus metrics and timing spans, aggregated across worker processes.
+
+Recording a sample is a lock-protected dict update, so instrumentation can
+sit on every request and upstream call. Each worker periodically writes
+its totals to the shared database; ``render_all()`` sums every worker's
+latest totals into the text exposition format served at ``/metrics``, so
+a scrape sees the same monotonic counters whichever worker answers it.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.services.database import Database
+
+logger = logging.getLogger("app.timing")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def export(self) -> List:
+        """This process's series as JSON-friendly ``[labels, value]`` pairs."""
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def combine(self, exports: List[List]) -> Dict[Tuple[str, ...], float]:
+        """Sum exported series from several processes."""
+        values: Dict[Tuple[str, ...], float] = {}
+        for series in exports:
+            for labels, value in series:
+                values[tuple(labels)] = values.get(tuple(labels), 0.0) + value
+        return values
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], float]] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def export(self) -> List:
+        """This process's series as JSON-friendly ``[labels, counts, sum, count]`` lists."""
+        with self._lock:
+            return [
+                [list(labels), list(counts), total, count]
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+    def combine(self, exports: List[List]) -> Dict[Tuple[str, ...], list]:
+        """Add up exported series from several processes, bucket by bucket."""
+        merged: Dict[Tuple[str, ...], list] = {}
+        for series in exports:
+            for labels, counts, total, count in series:
+                if len(counts) != len(self.buckets) + 1:
+                    # Written by a process with other bucket bounds
+                    continue
+                current = merged.setdefault(tuple(labels), [[0] * len(counts), 0.0, 0])
+                current[0] = [a + b for a, b in zip(current[0], counts)]
+                current[1] += total
+                current[2] += count
+        return merged
+
+    def render(self, series: Optional[Dict[Tuple[str, ...], list]] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        if series is None:
+            with self._lock:
+                series = {labels: [list(c), t, n] for labels, (c, t, n) in self._series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                label_str = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+http_request_duration = Histogram(
+    "p2025_http_request_duration_seconds",
+    "Router handler latency by route template and status",
+    ("method", "route", "status"),
+)
+span_duration = Histogram(
+    "p2025_span_duration_seconds",
+    "Duration of instrumented stages (upstream calls, parsing, rendering)",
+    ("span",),
+)
+span_errors = Counter(
+    "p2025_span_errors_total", "Instrumented stages that raised", ("span",)
+)
+cache_requests = Counter(
+    "p2025_cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+fallbacks = Counter(
+    "p2025_fallbacks_total",
+    "Analyses that returned a default value instead of a model answer",
+    ("function", "reason"),
+)
+llm_retries = Counter(
+    "p2025_llm_retries_total", "Retried LLM requests by error type", ("error",)
+)
+llm_tokens = Histogram(
+    "p2025_llm_tokens",
+    "Tokens per LLM completion",
+    ("kind",),
+    buckets=TOKEN_BUCKETS,
+)
+tagging_decisions = Counter(
+    "p2025_tagging_decisions_total",
+    "How RSS articles were tagged: local drop, local tag, LLM or reused",
+    ("stage",),
+)
+alert_transitions = Counter(
+    "p2025_alert_transitions_total", "Alert rule state changes", ("rule", "state")
+)
+
+REGISTRY = [
+    http_request_duration,
+    span_duration,
+    span_errors,
+    cache_requests,
+    fallbacks,
+    llm_retries,
+    llm_tokens,
+    tagging_decisions,
+    alert_transitions,
+]
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage and record it under ``p2025_span_duration_seconds{span=name}``."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        span_errors.inc(name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        span_duration.observe(elapsed, name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("span=%s duration_ms=%.1f", name, elapsed * 1000)
+
+
+def render() -> str:
+    """Metrics recorded by this process only."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS metric_totals (
+            worker TEXT PRIMARY KEY,
+            totals TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        """
+    )
+
+
+class MetricsStore:
+    """Each worker process's latest metric totals, in the shared database.
+
+    Rows of exited workers are kept (their counts stay in the sums, so
+    counters never go down) until they are ``metrics_retention_seconds`` old.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        # Unique per process even when a pid is reused after a restart
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{time.time():.0f}"
+
+    def save(self) -> None:
+        totals = json.dumps({metric.name: metric.export() for metric in REGISTRY})
+        now = time.time()
+        conn = self.db.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO metric_totals (worker, totals, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(worker) DO UPDATE SET totals = excluded.totals, "
+                "updated_at = excluded.updated_at",
+                (self.worker, totals, now),
+            )
+            conn.execute(
+                "DELETE FROM metric_totals WHERE updated_at < ?",
+                (now - settings.metrics_retention_seconds,),
+            )
+
+    def load(self) -> List[Dict]:
+        rows = self.db.connection().execute("SELECT totals FROM metric_totals").fetchall()
+        return [json.loads(row["totals"]) for row in rows]
+
+
+metrics_store = MetricsStore(Database(settings.database_path, init_schema=_init_schema))
+
+
+def render_all() -> str:
+    """Metrics summed over every worker process (blocking; call from a thread)."""
+    try:
+        metrics_store.save()
+        workers = metrics_store.load()
+    except Exception as e:
+        print(f"ERROR: Could not aggregate metrics across workers: {e}")
+        return render()
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render(metric.combine([w.get(metric.name, []) for w in workers])))
+    return "\n".join(lines) + "\n"
+
+
+async def flush() -> None:
+    """Write this process's totals for the other workers to include."""
+    try:
+        await asyncio.to_thread(metrics_store.save)
+    except Exception as e:
+        print(f"ERROR: Could not store metrics: {e}")
+
+
+async def flush_periodically() -> None:
+    """``flush`` every ``metrics_flush_interval`` until cancelled."""
+    while True:
+        await asyncio.sleep(settings.metrics_flush_interval)
+        await flush()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded
+            path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], path, str(status["code"])
+            )
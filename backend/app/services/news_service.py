@@ -1,82 +1,55 @@
+import asyncio
+import hashlib
 from typing import List, Dict, Tuple
-import requests
-from app.config import settings
+from app.services.articles import article_store
+
+NEWS_PAGE_SIZE = 5
+
+
+async def dedupe_articles(articles: List[Dict]) -> List[Dict]:
+    """Record articles in the shared corpus and drop copies of the same story."""
+    articles = [a for a in articles if a.get("url") and a.get("title")]
+    records = await asyncio.to_thread(
+        article_store.ingest_many,
+        [
+            {
+                "url": a["url"],
+                "title": a["title"],
+                "description": a.get("description") or "",
+                "source": (a.get("source") or {}).get("name", ""),
+                "published_at": a.get("publishedAt"),
+            }
+            for a in articles
+        ],
+    )
+    seen = set()
+    unique = []
+    for article, record in zip(articles, records):
+        if record["id"] not in seen:
+            seen.add(record["id"])
+            unique.append(article)
+    return unique
+
+
+def evidence_fingerprint(articles: List[Dict]) -> str:
+    """Order-independent digest of an evidence set (article URLs + publish dates)."""
+    parts = sorted(f"{a.get('url', '')}|{a.get('publishedAt') or ''}" for a in articles)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def summarize_evidence(articles: List[Dict], limit: int = 2) -> Tuple[List[str], List[Dict], str]:
+    """Summaries, up to ``limit`` article links and the evidence fingerprint for articles."""
+    summaries = []
+    links = []
+    evidence = []
+    for article in articles:
+        if article.get("description"):
+            evidence.append(article)
+            summaries.append(f"{article['title']}. {article['description']}")
+            if len(links) < limit and article.get("url"):
+                links.append({
+                    "title": article["title"][:80] + "..." if len(article["title"]) > 80 else article["title"],
+                    "url": article["url"],
+                })
+    return summaries, links, evidence_fingerprint(evidence) if evidence else ""
 
-NEWS_API_BASE_URL = "https://newsapi.org/v2/everything"
-
-
-def search_news_with_links(query: str, limit: int = 2) -> Tuple[List[str], List[Dict]]:
-    """Search news articles and return both summaries and article links."""
-    if not settings.news_api_key:
-        print("ERROR: NEWS_API_KEY not configured")
-        return [], []
-
-    params = {
-        "q": query,
-        "language": "en",
-        "sortBy": "relevancy",
-        "apiKey": settings.news_api_key,
-        "pageSize": 5,
-    }
-
-    try:
-        response = requests.get(NEWS_API_BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        summaries = []
-        links = []
-        if data and data.get("articles"):
-            for article in data["articles"]:
-                if article.get("description"):
-                    summaries.append(f"{article['title']}. {article['description']}")
-                    if len(links) < limit and article.get("url"):
-                        links.append({
-                            "title": article["title"][:80] + "..." if len(article["title"]) > 80 else article["title"],
-                            "url": article["url"],
-                        })
-        return summaries, links
-
-    except Exception as e:
-        print(f"ERROR: News search error for '{query}': {e}")
-        return [], []
-
-
-def search_news(query: str) -> List[str]:
-    """Search news articles using NewsAPI."""
-    if not settings.news_api_key:
-        print("ERROR: NEWS_API_KEY not configured")
-        return []
-
-    params = {
-        "q": query,
-        "language": "en",
-        "sortBy": "relevancy",
-        "apiKey": settings.news_api_key,
-        "pageSize": 5,
-    }
-
-    try:
-        response = requests.get(NEWS_API_BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        articles = []
-        if data and data.get("articles"):
-            for article in data["articles"]:
-                if article.get("description"):
-                    articles.append(f"{article['title']}. {article['description']}")
-        return articles
-
-    except requests.exceptions.Timeout:
-        print(f"ERROR: News API Timeout for '{query}'")
-        return []
-    except requests.exceptions.HTTPError as e:
-        print(f"ERROR: News API HTTP Error for '{query}': {e.response.status_code}")
-        return []
-    except requests.exceptions.RequestException as e:
-        print(f"ERROR: News API Request Exception for '{query}': {e}")
-        return []
-    except Exception as e:
-        print(f"ERROR: Unexpected error in news search for '{query}': {e}")
-        return []
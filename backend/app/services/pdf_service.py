@@ -1,10 +1,22 @@
-import tempfile
-from typing import Dict, List
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 from fpdf import FPDF
+from app.config import settings
+from app.services.metrics import cache_requests, span
 
+_report_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_report_cache_lock = threading.Lock()
 
-def generate_pdf_report(progress_data: List[Dict], events: List[Dict]) -> str:
-    """Generate a PDF report and return the file path."""
+
+def _latin1(text: str) -> str:
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def generate_pdf_report(progress_data: List[Dict], events: List[Dict]) -> bytes:
+    """Render the PDF report in memory and return its bytes."""
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -27,10 +39,39 @@ def generate_pdf_report(progress_data: List[Dict], events: List[Dict]) -> str:
     pdf.cell(200, 10, txt="Recent Events", ln=True)
     pdf.set_font("Arial", size=11)
     for event in events:
-        pdf.cell(200, 8, txt=f"{event['title']} ({event['date']})", ln=True)
-        summary_text = str(event["summary"]).encode("latin-1", "replace").decode("latin-1")
-        pdf.multi_cell(0, 8, txt=summary_text)
+        pdf.cell(200, 8, txt=_latin1(f"{event['title']} ({event['date']})"), ln=True)
+        pdf.multi_cell(0, 8, txt=_latin1(event["summary"]))
+
+    output = pdf.output(dest="S")
+    # PyFPDF returns a latin-1 str, fpdf2 returns a bytearray
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+def report_digest(progress_data: List[Dict], events: List[Dict]) -> str:
+    """Hash of everything that affects the rendered report."""
+    payload = json.dumps(
+        {"progress": progress_data, "events": events},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_pdf_report(progress_data: List[Dict], events: List[Dict]) -> Tuple[str, bytes]:
+    """Return (digest, pdf bytes), rendering only when the inputs changed."""
+    digest = report_digest(progress_data, events)
+    with _report_cache_lock:
+        cached = _report_cache.get(digest)
+        if cached is not None:
+            _report_cache.move_to_end(digest)
+            cache_requests.inc("pdf_report", "hit")
+            return digest, cached
+    cache_requests.inc("pdf_report", "miss")
 
-    temp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    pdf.output(temp.name)
-    return temp.name
+    with span("pdf.render"):
+        pdf_bytes = generate_pdf_report(progress_data, events)
+    with _report_cache_lock:
+        _report_cache[digest] = pdf_bytes
+        while len(_report_cache) > settings.pdf_cache_max_entries:
+            _report_cache.popitem(last=False)
+    return digest, pdf_bytes
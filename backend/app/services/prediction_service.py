@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import time
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+from app.models.schemas import Prediction, PredictionList
+from app.services.catalog import DEFAULT_STATUS, PredictionCatalog, prediction_catalog
+from app.services.news_service import summarize_evidence
+from app.services.ai_service import score_prediction_status
+from app.services.metrics import cache_requests
+from app.services.retrieval import retrieval_planner
+from app.services.scheduler import PREDICTIONS_JOB
+from app.services.singleflight import flights
+from app.services.snapshots import snapshot_store
+from app.services.store import evidence_store
+
+EVIDENCE_KIND = "prediction"
+
+
+def _retrieval_key(prediction_id: int) -> str:
+    return f"{EVIDENCE_KIND}:{prediction_id}"
+
+
+for _prediction in prediction_catalog.all():
+    retrieval_planner.register(
+        _retrieval_key(_prediction.id), f"Project 2025 {_prediction.prediction}"
+    )
+
+
+async def synced_catalog() -> PredictionCatalog:
+    """The catalog with the most recently published scores applied."""
+    snapshot = await snapshot_store.aget(PREDICTIONS_JOB)
+    if snapshot is not None:
+        prediction_catalog.sync(
+            (snapshot.version, snapshot.updated_at), snapshot.data.predictions
+        )
+    return prediction_catalog
+
+
+async def get_predictions() -> List[Prediction]:
+    return (await synced_catalog()).all()
+
+
+async def score_single_prediction(
+    pred: Prediction, articles: Optional[List[Dict]] = None
+) -> Prediction:
+    """Fetch news and score one prediction without blocking the event loop.
+
+    The previous status is reused when the evidence fingerprint is unchanged.
+    ``articles`` come from a run's prefetch; they are looked up when omitted.
+    """
+    prediction_text = pred.prediction
+    if articles is None:
+        articles = await retrieval_planner.articles_for(_retrieval_key(pred.id))
+    news_summaries, _, fingerprint = summarize_evidence(articles)
+    combined_news = "\n".join(news_summaries) if news_summaries else ""
+
+    new_status = None
+    if combined_news:
+        new_status = await asyncio.to_thread(
+            evidence_store.lookup, EVIDENCE_KIND, prediction_text, fingerprint
+        )
+        cache_requests.inc("evidence", "miss" if new_status is None else "hit")
+    if new_status is None:
+        new_status = await score_prediction_status(prediction_text, combined_news)
+        if new_status is None:
+            # Not a model answer: don't record it, so the next run asks again
+            new_status = DEFAULT_STATUS
+        else:
+            await asyncio.to_thread(
+                evidence_store.record, EVIDENCE_KIND, prediction_text, fingerprint, new_status
+            )
+
+    return pred.model_copy(update={"result": new_status, "news_match": combined_news})
+
+
+async def score_predictions(
+    ids: Optional[List[int]] = None,
+    on_result: Optional[Callable[[Prediction], None]] = None,
+) -> PredictionList:
+    """Fetch news and score the given catalog predictions (all when ``ids`` is None).
+
+    ``on_result`` is called with each prediction as soon as it is scored.
+    Returns the whole catalog with the new scores merged in. Concurrent
+    callers asking for the same predictions share a single run.
+    """
+    if ids is None:
+        key = "score_all_predictions"
+    else:
+        key = "score_predictions:" + hashlib.sha1(
+            ",".join(map(str, sorted(set(ids)))).encode("ascii")
+        ).hexdigest()
+    return await flights.do_streaming(
+        key, lambda publish: _score_predictions(ids, publish), on_result
+    )
+
+
+async def score_all_predictions(
+    on_result: Optional[Callable[[Prediction], None]] = None,
+) -> PredictionList:
+    """Fetch news and score every prediction in the catalog."""
+    return await score_predictions(None, on_result)
+
+
+def scheduled_prediction_ids() -> List[int]:
+    """Ids due in the current refresh interval: the next slice of the catalog.
+
+    The slice follows from the wall clock rather than process state, so the
+    rotation carries on across restarts and leader changes.
+    """
+    ids = [prediction.id for prediction in prediction_catalog.all()]
+    batch = settings.predictions_refresh_batch
+    if batch <= 0 or batch >= len(ids):
+        return ids
+    interval = settings.predictions_refresh_interval
+    slot = int(time.time() // interval) if interval > 0 else 0
+    start = slot * batch % len(ids)
+    return [ids[(start + offset) % len(ids)] for offset in range(batch)]
+
+
+async def score_scheduled_predictions(
+    on_result: Optional[Callable[[Prediction], None]] = None,
+) -> PredictionList:
+    """Score the slice of the catalog due in this refresh interval (the periodic job)."""
+    ids = scheduled_prediction_ids()
+    if len(ids) == len(prediction_catalog):
+        return await score_predictions(None, on_result)
+    return await score_predictions(ids, on_result)
+
+
+async def _score_predictions(
+    ids: Optional[List[int]],
+    on_result: Callable[[Prediction], None],
+) -> PredictionList:
+    catalog = await synced_catalog()
+    targets = catalog.all() if ids is None else catalog.get_many(ids)
+    retrieved = await retrieval_planner.prefetch([_retrieval_key(p.id) for p in targets])
+
+    async def run(pred: Prediction) -> Prediction:
+        prediction = await score_single_prediction(pred, retrieved[_retrieval_key(pred.id)])
+        on_result(prediction)
+        return prediction
+
+    scored_predictions = await asyncio.gather(*(run(pred) for pred in targets))
+    catalog.apply(scored_predictions)
+    return PredictionList(predictions=catalog.all())
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from app.models.schemas import ProgressList, ProgressItem, ArticleLink
+from app.services.alerts import alert_engine
+from app.services.news_service import summarize_evidence
+from app.services.ai_service import analyze_category_progress, AGENDA_CATEGORIES
+from app.services.metrics import cache_requests
+from app.services.retrieval import retrieval_planner
+from app.services.singleflight import flights
+from app.services.store import evidence_store, progress_store
+
+EVIDENCE_KIND = "progress"
+
+SEARCH_QUERIES = {
+    "Federal Agency Capture": "Trump federal agency firings appointments Schedule F",
+    "Judicial Defiance": "Trump court order defiance judicial ruling ignored",
+    "Suppression of Dissent": "Trump protesters arrests journalists detained free speech",
+    "NATO Disengagement": "Trump NATO alliance withdrawal Europe defense",
+    "Media Subversion": "Trump media fake news press freedom journalists",
+}
+
+
+def _retrieval_key(category: str) -> str:
+    return f"{EVIDENCE_KIND}:{category}"
+
+
+for _category in AGENDA_CATEGORIES:
+    retrieval_planner.register(
+        _retrieval_key(_category),
+        SEARCH_QUERIES.get(_category, f"Trump administration {_category}"),
+    )
+
+
+def get_current_date() -> str:
+    return date.today().isoformat()
+
+
+def build_progress_list() -> ProgressList:
+    """Build the progress response from the current store contents."""
+    items = []
+    for category, data in progress_store.all().items():
+        items.append(
+            ProgressItem(
+                title=category,
+                progress=data["progress"],
+                last_updated=data["last_updated"] or "Not analyzed yet",
+                articles=[ArticleLink(**a) for a in data.get("articles", [])],
+            )
+        )
+    return ProgressList(items=items)
+
+
+async def analyze_category(
+    category: str, current_date: str, articles: Optional[List[Dict]] = None
+) -> Tuple[str, Dict]:
+    """Fetch news for one category and estimate its progress.
+
+    The LLM is skipped when the evidence fingerprint matches the one the
+    stored progress was computed from.
+    ``articles`` come from a run's prefetch; they are looked up when omitted.
+    When the model gives no usable answer the stored progress is reported
+    and the result is marked ``fallback``, so the run does not persist it.
+    """
+    if articles is None:
+        articles = await retrieval_planner.articles_for(_retrieval_key(category))
+    news_summaries, article_links, fingerprint = summarize_evidence(articles, limit=2)
+    combined_news = "\n".join(news_summaries) if news_summaries else ""
+
+    fallback = False
+    if combined_news:
+        progress = await asyncio.to_thread(
+            evidence_store.lookup, EVIDENCE_KIND, category, fingerprint
+        )
+        cache_requests.inc("evidence", "miss" if progress is None else "hit")
+        if progress is None:
+            progress = await analyze_category_progress(category, combined_news)
+            if progress is None:
+                # Not a model answer: keep the stored value and record nothing,
+                # so the next run asks again
+                progress = (await asyncio.to_thread(progress_store.get, category))["progress"]
+                fallback = True
+            else:
+                await asyncio.to_thread(
+                    evidence_store.record, EVIDENCE_KIND, category, fingerprint, progress
+                )
+    else:
+        # Keep existing progress if no news found
+        progress = (await asyncio.to_thread(progress_store.get, category))["progress"]
+
+    return category, {
+        "progress": progress,
+        "last_updated": current_date,
+        "articles": article_links,
+        "fallback": fallback,
+    }
+
+
+async def analyze_all_categories(
+    on_result: Optional[Callable[[ProgressItem], None]] = None,
+) -> ProgressList:
+    """Fetch news and analyze progress for all categories using AI.
+
+    Categories run concurrently; ``on_result`` is called with each item as
+    soon as its category finishes. The store is updated once, atomically,
+    after every category is done. Concurrent callers share a single run.
+    """
+    return await flights.do_streaming(
+        "analyze_all_categories", _analyze_all_categories, on_result
+    )
+
+
+async def _analyze_all_categories(
+    on_result: Callable[[ProgressItem], None],
+) -> ProgressList:
+    current_date = get_current_date()
+    results = {}
+    retrieved = await retrieval_planner.prefetch([_retrieval_key(c) for c in AGENDA_CATEGORIES])
+
+    async def run(category: str) -> None:
+        name, data = await analyze_category(
+            category, current_date, retrieved[_retrieval_key(category)]
+        )
+        results[name] = data
+        on_result(
+            ProgressItem(
+                title=name,
+                progress=data["progress"],
+                last_updated=data["last_updated"],
+                articles=[ArticleLink(**a) for a in data["articles"]],
+            )
+        )
+
+    await asyncio.gather(*(run(category) for category in AGENDA_CATEGORIES))
+
+    # Fallbacks stay out of the history and the alert rules, which would
+    # otherwise see the unchanged stored value as a fresh sample
+    analyzed = {name: data for name, data in results.items() if not data["fallback"]}
+    await asyncio.to_thread(progress_store.replace_all, analyzed)
+    await alert_engine.ingest({name: data["progress"] for name, data in analyzed.items()})
+    return build_progress_list()
@@ -0,0 +1,122 @@
+import re
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import settings
+from app.services.ai_service import AGENDA_CATEGORIES, CATEGORY_DESCRIPTIONS
+
+# Extra vocabulary per category so prototypes cover the words news copy actually uses
+CATEGORY_KEYWORDS = {
+    "Federal Agency Capture": "federal agency agencies civil service schedule firing fired layoffs inspector general loyalist appointee purge staff workforce doge bureaucracy department employees",
+    "Judicial Defiance": "court courts judge judges ruling ruled order injunction supreme defy defied contempt judiciary unconstitutional appeals lawsuit",
+    "Suppression of Dissent": "protest protesters arrest arrested detained activists dissent crackdown critics opposition speech guard deport intimidation surveillance",
+    "NATO Disengagement": "nato alliance allies europe european defense spending ukraine russia putin withdrawal troops summit",
+    "Media Subversion": "media press journalists journalism news outlet fake broadcaster fcc reporters censorship disinformation propaganda broadcasting",
+}
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the "
+    "this to was were will with which who what when where how their they them these those "
+    "said says new also more than after over about".split()
+)
+_WORD = re.compile(r"[a-z]+")
+_SUFFIXES = ("ing", "ed", "es", "s")
+_VOWELS = frozenset("aeiou")
+
+
+def stem(word: str) -> str:
+    """Light suffix stripper: inflections of a word share one stem.
+
+    "fire", "fires", "fired" and "firing" all become "fir"; "agency" and
+    "agencies" become "agenci". Stems are only compared with each other, so
+    they need to be consistent, not real words.
+    """
+    if len(word) > 4 and word.endswith(("ies", "ied")):
+        return word[:-3] + "i"
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                break
+            word = word[: -len(suffix)]
+            break
+    # "stopped" -> "stopp" -> "stop"; "press" -> "pres" like "presses"
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in _VOWELS:
+        word = word[:-1]
+    stripped = word.rstrip("e")
+    if len(stripped) >= 3:
+        word = stripped
+    if len(word) > 3 and word.endswith("y"):
+        word = word[:-1] + "i"
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        stem(word)
+        for word in _WORD.findall(text.lower())
+        if word not in STOP_WORDS and len(word) >= 3
+    ]
+
+
+class RelevanceModel:
+    """TF-IDF cosine similarity between articles and per-category prototype vectors."""
+
+    def __init__(self, prototypes: Dict[str, str]):
+        self.categories = list(prototypes)
+        docs = [tokenize(prototypes[c]) for c in self.categories]
+        self.vocabulary = {term: i for i, term in enumerate(sorted({t for d in docs for t in d}))}
+        df = np.zeros(len(self.vocabulary))
+        for doc in docs:
+            for term in set(doc):
+                df[self.vocabulary[term]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        self.prototypes = self._vectorize(docs)
+
+    def _vectorize(self, docs: List[List[str]]) -> np.ndarray:
+        matrix = np.zeros((len(docs), len(self.vocabulary)))
+        for row, doc in enumerate(docs):
+            for term in doc:
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    matrix[row, column] += 1
+        # Sublinear term frequency, then IDF weighting and L2 normalisation
+        np.log1p(matrix, out=matrix)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def scores(self, texts: List[str]) -> np.ndarray:
+        """Cosine similarity of each text to each category, shape (len(texts), categories)."""
+        if not texts:
+            return np.zeros((0, len(self.categories)))
+        return self._vectorize([tokenize(t) for t in texts]) @ self.prototypes.T
+
+    def prefilter(self, texts: List[str]) -> List[Optional[str]]:
+        """Decide what can be settled locally.
+
+        Returns "None" for articles with no meaningful overlap with any
+        category, a category name when one category clearly dominates, and
+        None (undecided) for everything that still needs the LLM.
+        """
+        scores = self.scores(texts)
+        if not len(scores):
+            return []
+        ranked = np.sort(scores, axis=1)
+        best = ranked[:, -1]
+        margin = best - (ranked[:, -2] if scores.shape[1] > 1 else 0)
+        best_index = scores.argmax(axis=1)
+
+        decisions: List[Optional[str]] = []
+        for i in range(len(texts)):
+            if best[i] < settings.relevance_min_score:
+                decisions.append("None")
+            elif best[i] >= settings.relevance_pretag_score and margin[i] >= settings.relevance_pretag_margin:
+                decisions.append(self.categories[best_index[i]])
+            else:
+                decisions.append(None)
+        return decisions
+
+
+relevance_model = RelevanceModel({
+    category: f"{category} {CATEGORY_DESCRIPTIONS[category]} {CATEGORY_KEYWORDS[category]}"
+    for category in AGENDA_CATEGORIES
+})
@@ -0,0 +1,170 @@
+"""Retrieval planner: one set of combined NewsAPI queries per refresh.
+
+Every category and prediction registers its search query here. A refresh
+packs all of them into as few ``(a) OR (b) OR ...`` queries as the API's
+query-length limit allows, pages through the results once, and routes each
+article back to the items whose terms it matches. Runs prefetch just the
+items they cover, so scoring a subset of predictions only searches for
+that subset; results are reused while fresh.
+"""
+import asyncio
+import hashlib
+import re
+import time
+from typing import Dict, List, Tuple
+import httpx
+from app.config import settings
+from app.providers import get_news_provider
+from app.services.limits import news_api_limiter
+from app.services.metrics import span
+from app.services.news_service import NEWS_PAGE_SIZE, dedupe_articles
+from app.services.singleflight import flights
+
+STOPWORDS = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "of", "on", "or",
+    "the", "to", "with",
+}
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct lowercase search terms of a query, minus stopwords and single characters."""
+    terms = []
+    for token in _TOKEN.findall(query.lower()):
+        if len(token) > 1 and token not in STOPWORDS and token not in terms:
+            terms.append(token)
+    return terms
+
+
+def plan_queries(queries: List[str], max_chars: int) -> List[str]:
+    """Pack queries into as few OR-combined queries as fit within ``max_chars``."""
+    plans: List[str] = []
+    current = ""
+    for query in queries:
+        group = f"({query})"
+        candidate = f"{current} OR {group}" if current else group
+        if current and len(candidate) > max_chars:
+            plans.append(current)
+            candidate = group
+        current = candidate
+    if current:
+        plans.append(current)
+    return plans
+
+
+class RetrievalPlanner:
+    """Fetches news for many registered queries at once and routes it locally."""
+
+    def __init__(self):
+        self._queries: Dict[str, str] = {}
+        self._terms: Dict[str, List[str]] = {}
+        # key -> (expires_at, routed articles)
+        self._routed: Dict[str, Tuple[float, List[Dict]]] = {}
+
+    def register(self, key: str, query: str) -> None:
+        if self._queries.get(key) == query:
+            return
+        self._queries[key] = query
+        self._terms[key] = query_terms(query)
+        self._routed.pop(key, None)
+
+    def _is_fresh(self, key: str) -> bool:
+        routed = self._routed.get(key)
+        return routed is not None and time.time() < routed[0]
+
+    def _routed_articles(self, key: str) -> List[Dict]:
+        routed = self._routed.get(key)
+        return routed[1] if routed else []
+
+    async def prefetch(self, keys: List[str]) -> Dict[str, List[Dict]]:
+        """Retrieve news for every stale key among ``keys`` in one combined pass.
+
+        Returns the articles routed to each key, so a run uses this pass's
+        results even when ``news_retrieval_ttl`` is 0.
+        """
+        stale = sorted(key for key in set(keys) if key in self._queries and not self._is_fresh(key))
+        if stale:
+            flight = "news_retrieval:" + hashlib.sha1("\n".join(stale).encode("utf-8")).hexdigest()
+            await flights.do(flight, lambda: self._refresh(stale))
+        return {key: self._routed_articles(key) for key in keys}
+
+    async def articles_for(self, key: str) -> List[Dict]:
+        """Articles routed to one registered item, best match first."""
+        if not self._is_fresh(key):
+            await self.prefetch([key])
+        return self._routed_articles(key)
+
+    async def _refresh(self, keys: List[str]) -> None:
+        articles = await self._fetch_all([self._queries[key] for key in keys])
+        # Routing is CPU-bound and grows with keys x articles; keep it off the loop
+        routed = await asyncio.to_thread(self.route, articles, keys)
+        # An empty retrieval (no key, upstream down or out of quota) is kept
+        # for a short backoff, so items don't each retry with their own query
+        lifetime = settings.news_retrieval_ttl if articles else settings.news_retrieval_failure_backoff
+        expires_at = time.time() + lifetime
+        for key in keys:
+            self._routed[key] = (expires_at, routed[key])
+
+    async def _fetch_all(self, queries: List[str]) -> List[Dict]:
+        provider = get_news_provider()
+        if not provider:
+            print("ERROR: NEWS_API_KEY not configured")
+            return []
+
+        async def fetch_plan(query: str) -> List[Dict]:
+            articles: List[Dict] = []
+            for page in range(1, settings.news_max_pages + 1):
+                try:
+                    async with news_api_limiter:
+                        with span("news.search"):
+                            batch = await provider.search(
+                                query, page_size=settings.news_page_size, page=page
+                            )
+                except httpx.HTTPStatusError as e:
+                    # Plans past the result cap answer with an error; keep earlier pages
+                    print(f"ERROR: News API HTTP Error on page {page}: {e.response.status_code}")
+                    break
+                except Exception as e:
+                    print(f"ERROR: News search error on page {page}: {e}")
+                    break
+                articles.extend(batch)
+                if len(batch) < settings.news_page_size:
+                    break
+            return articles
+
+        plans = plan_queries(queries, settings.news_query_max_chars)
+        results = await asyncio.gather(*(fetch_plan(query) for query in plans))
+        return await dedupe_articles([a for batch in results for a in batch])
+
+    def route(self, articles: List[Dict], keys: List[str]) -> Dict[str, List[Dict]]:
+        """Assign articles to each of ``keys`` whose query terms they sufficiently match.
+
+        A key scores the share of its terms that appear in the article as
+        whole words. An index from term to keys means each article only
+        scores the keys it shares a term with, not every key.
+        """
+        keys_by_term: Dict[str, List[str]] = {}
+        for key in keys:
+            for term in self._terms[key]:
+                keys_by_term.setdefault(term, []).append(key)
+
+        scored: Dict[str, List[Tuple[float, int]]] = {key: [] for key in keys}
+        for rank, article in enumerate(articles):
+            text = f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+            hits: Dict[str, int] = {}
+            for token in set(_TOKEN.findall(text)):
+                for key in keys_by_term.get(token, ()):
+                    hits[key] = hits.get(key, 0) + 1
+            for key, count in hits.items():
+                score = count / len(self._terms[key])
+                if score >= settings.retrieval_min_match:
+                    scored[key].append((score, rank))
+
+        routed = {}
+        for key, matches in scored.items():
+            matches.sort(key=lambda pair: (-pair[0], pair[1]))
+            routed[key] = [articles[rank] for _, rank in matches[:NEWS_PAGE_SIZE]]
+        return routed
+
+
+retrieval_planner = RetrievalPlanner()
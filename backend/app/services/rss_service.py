@@ -1,47 +1,211 @@
+import asyncio
 import datetime
-from typing import Dict, List
-import feedparser
-from app.services.ai_service import assign_tag_with_ai
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+from app.models.schemas import GeopoliticalFeed, GeopoliticalArticle
+from app.providers import get_feed_provider
+from app.services.ai_service import assign_tags_with_ai
+from app.services.articles import article_store
+from app.services.feed_parser import iter_feed_items
+from app.services.metrics import cache_requests, span, tagging_decisions
+from app.services.relevance import relevance_model
+from app.services.singleflight import flights
 
 RSS_URLS = [
     "http://feeds.reuters.com/Reuters/worldNews",
     "http://feeds.bbci.co.uk/news/world/rss.xml",
     "https://apnews.com/rss/apf-topnews",
 ]
+# New items are written to the article store in batches while the feed streams
+INGEST_BATCH_SIZE = 50
 
 
-def fetch_geopolitical_updates() -> List[Dict]:
-    """Fetch and tag geopolitical news from RSS feeds."""
-    articles = []
-
-    for url in RSS_URLS:
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:1]:
-                title = entry.title
-                summary = entry.summary if hasattr(entry, "summary") else ""
-                full_text = f"Title: {title}\nSummary: {summary}"
-
-                try:
-                    tag = assign_tag_with_ai(full_text)
-                except Exception as e:
-                    print(f"ERROR: Exception during AI tagging for '{title}': {e}")
-                    tag = "Untagged (AI Error)"
-
-                date_str = "N/A"
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    date_str = datetime.datetime(
-                        *entry.published_parsed[:6]
-                    ).strftime("%Y-%m-%d")
-
-                articles.append({
-                    "title": title,
-                    "date": date_str,
-                    "summary": summary,
-                    "link": entry.link,
-                    "tags": [tag] if tag and tag != "None" else [],
-                })
-        except Exception as e:
-            print(f"ERROR: Failed to fetch RSS feed from {url}: {e}")
+@dataclass
+class FeedState:
+    """Validators and the newest item seen on the last successful read of a feed."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_guid: Optional[str] = None
+    last_published: Optional[datetime.datetime] = None
+
+
+_feed_states: Dict[str, FeedState] = {}
+
+
+def _source(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+async def _new_items(chunks: AsyncIterator[bytes], state: FeedState) -> AsyncIterator[Dict]:
+    """Items newer than the last read, stopping at the first one already seen.
+
+    Feeds list newest first, so reaching the last seen GUID, or an item
+    older than the last seen date, means the rest of the body is old news.
+    """
+    count = 0
+    async for item in iter_feed_items(chunks):
+        if state.last_guid is not None and item["guid"] == state.last_guid:
+            return
+        if (
+            state.last_published is not None
+            and item["published"] is not None
+            and item["published"] < state.last_published
+        ):
+            return
+        yield item
+        count += 1
+        if count >= settings.rss_max_items_per_feed:
+            return
+
+
+def _to_record(item: Dict, source: str) -> Dict:
+    published = item["published"]
+    return {
+        "url": item["link"],
+        "title": item["title"],
+        "description": item["summary"],
+        "source": source,
+        "published_at": published.isoformat() if published else None,
+    }
+
+
+async def _fetch_feed(url: str) -> int:
+    """Stream one feed with a conditional GET and store its new items; returns how many."""
+    state = _feed_states.setdefault(url, FeedState())
+    source = _source(url)
+    newest: Optional[Dict] = None
+    latest = state.last_published
+    batch: List[Dict] = []
+    stored = 0
+
+    with span("rss.fetch"):
+        async with get_feed_provider().stream(url, state.etag, state.last_modified) as response:
+            if response.status_code == 304:
+                cache_requests.inc("rss_feed", "hit")
+                return 0
+            cache_requests.inc("rss_feed", "miss")
+
+            async for item in _new_items(response.chunks, state):
+                if not item["link"] or not item["title"]:
+                    continue
+                newest = newest or item
+                if item["published"] and (latest is None or item["published"] > latest):
+                    latest = item["published"]
+                batch.append(_to_record(item, source))
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    await asyncio.to_thread(article_store.ingest_many, batch)
+                    stored += len(batch)
+                    batch = []
+    if batch:
+        await asyncio.to_thread(article_store.ingest_many, batch)
+        stored += len(batch)
+
+    state.etag = response.etag
+    state.last_modified = response.last_modified
+    if newest is not None:
+        state.last_guid = newest["guid"]
+    state.last_published = latest
+    return stored
+
+
+async def _fetch_feed_safely(url: str) -> int:
+    try:
+        return await asyncio.wait_for(_fetch_feed(url), timeout=settings.rss_feed_timeout)
+    except asyncio.TimeoutError:
+        print(f"ERROR: Timed out fetching RSS feed from {url}")
+    except Exception as e:
+        print(f"ERROR: Failed to fetch RSS feed from {url}: {e}")
+    # Articles stored by earlier reads are still served, so one bad feed does not empty the page
+    return 0
+
+
+async def fetch_geopolitical_updates() -> List[Dict]:
+    """Fetch and tag geopolitical news from RSS feeds.
+
+    Concurrent callers share one fetch-and-tag run.
+    """
+    return await flights.do("fetch_geopolitical_updates", _fetch_geopolitical_updates)
+
+
+async def _fetch_geopolitical_updates() -> List[Dict]:
+    await asyncio.gather(*(_fetch_feed_safely(url) for url in RSS_URLS))
+
+    # The page shows the newest stored stories; near-duplicates resolved at ingest
+    records = await asyncio.to_thread(
+        article_store.recent,
+        [_source(url) for url in RSS_URLS],
+        settings.geopolitical_max_articles,
+    )
+    articles = [
+        {
+            "id": record["id"],
+            "title": record["title"],
+            "date": (record["published_at"] or "N/A")[:10],
+            "summary": record["description"],
+            "link": record["url"],
+            "tag": record["tag"],
+        }
+        for record in records
+    ]
+
+    # Settle clear-cut stories locally; only ambiguous ones go to the AI
+    untagged = [a for a in articles if a["tag"] is None]
+    tagging_decisions.inc("reused", amount=len(articles) - len(untagged))
+    if settings.relevance_prefilter_enabled and untagged:
+        decisions = relevance_model.prefilter(
+            [f"{a['title']} {a['summary']}" for a in untagged]
+        )
+        decided = {a["id"]: tag for a, tag in zip(untagged, decisions) if tag is not None}
+        # Local drops are not stored: they are cheap to recompute, and a stemming
+        # or keyword change can still send the article to the AI later
+        await asyncio.to_thread(
+            article_store.set_tags, {i: tag for i, tag in decided.items() if tag != "None"}
+        )
+        for article in untagged:
+            article["tag"] = decided.get(article["id"])
+        dropped = sum(1 for tag in decided.values() if tag == "None")
+        tagging_decisions.inc("local_drop", amount=dropped)
+        tagging_decisions.inc("local_tag", amount=len(decided) - dropped)
+        untagged = [a for a in untagged if a["tag"] is None]
+    tagging_decisions.inc("llm", amount=len(untagged))
+
+    # Tag only stories never classified before, in as few AI requests as possible
+    full_texts = [f"Title: {a['title']}\nSummary: {a['summary']}" for a in untagged]
+    try:
+        tags = await assign_tags_with_ai(full_texts)
+        # Only model answers are final; failed rows stay NULL and are retried next refresh
+        await asyncio.to_thread(
+            article_store.set_tags,
+            {a["id"]: tag for a, tag in zip(untagged, tags) if tag is not None},
+        )
+    except Exception as e:
+        print(f"ERROR: Exception during AI tagging: {e}")
+        tags = ["Untagged (AI Error)"] * len(untagged)
+    for article, tag in zip(untagged, tags):
+        article["tag"] = tag
+
+    for article in articles:
+        tag = article.pop("tag")
+        article.pop("id")
+        article["tags"] = [tag] if tag and tag != "None" else []
 
     return articles
+
+
+async def build_geopolitical_feed() -> GeopoliticalFeed:
+    """Fetch and tag the feeds and build the response model."""
+    articles_data = await fetch_geopolitical_updates()
+    articles = [
+        GeopoliticalArticle(
+            title=a["title"],
+            date=a["date"],
+            summary=a["summary"],
+            link=a["link"],
+            tags=a["tags"],
+        )
+        for a in articles_data
+    ]
+    return GeopoliticalFeed(articles=articles)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.config import settings
+from app.services.singleflight import flights
+from app.services.snapshots import Snapshot, snapshot_store
+
+GEOPOLITICAL_JOB = "geopolitical"
+PROGRESS_JOB = "progress"
+PREDICTIONS_JOB = "predictions"
+
+
+@dataclass
+class RefreshJob:
+    name: str
+    refresh: Callable[[], Awaitable[Any]]
+    interval: float
+    last_run: Optional[Callable[[], Optional[float]]] = None
+    in_flight: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class RefreshScheduler:
+    """Runs refresh jobs on fixed intervals and publishes their results as snapshots."""
+
+    def __init__(self):
+        self._jobs: Dict[str, RefreshJob] = {}
+        self._loops: List[asyncio.Task] = []
+        # With several workers only the elected leader refreshes stale snapshots
+        self.is_leader = True
+
+    def register(
+        self,
+        name: str,
+        refresh: Callable[[], Awaitable[Any]],
+        interval: float,
+        last_run: Optional[Callable[[], Optional[float]]] = None,
+    ) -> None:
+        """Register a job. An interval of 0 disables periodic runs (on-demand only).
+
+        ``last_run`` returns the timestamp of the last persisted run, so a
+        restart waits out the remaining interval instead of recomputing.
+        """
+        self._jobs[name] = RefreshJob(
+            name=name, refresh=refresh, interval=interval, last_run=last_run
+        )
+
+    async def _run(self, job: RefreshJob) -> Optional[Snapshot]:
+        try:
+            data = await job.refresh()
+        except Exception as e:
+            print(f"ERROR: Refresh job '{job.name}' failed: {e}")
+            return await snapshot_store.aget(job.name)
+        return await snapshot_store.apublish(job.name, data)
+
+    def trigger(self, name: str) -> "asyncio.Task[Optional[Snapshot]]":
+        """Start a refresh unless one is already running; return the in-flight task."""
+        job = self._jobs[name]
+        if job.in_flight is None or job.in_flight.done():
+            job.in_flight = asyncio.create_task(self._run(job))
+        return job.in_flight
+
+    async def refresh_now(self, name: str) -> Optional[Snapshot]:
+        """Run (or join) a refresh and wait for the resulting snapshot."""
+        return await asyncio.shield(self.trigger(name))
+
+    async def get_snapshot(self, name: str, max_age: Optional[float] = None) -> Optional[Snapshot]:
+        """Serve the latest snapshot with stale-while-revalidate semantics.
+
+        A stale snapshot is returned immediately while a background refresh
+        runs (on the leader; followers leave that to it). Only a cold start
+        with no snapshot at all waits: the leader for its own refresh, a
+        follower for the leader to publish one (None if that times out).
+        Jobs without a periodic interval are never run by the leader on its
+        own, so any worker refreshes those itself.
+        """
+        snapshot = await snapshot_store.aget(name)
+        refreshes_here = self.is_leader or self._jobs[name].interval <= 0
+        if snapshot is None:
+            if refreshes_here:
+                return await self.refresh_now(name)
+            return await flights.do(f"snapshot_wait:{name}", lambda: self._wait_for_leader(name))
+        if max_age is not None and snapshot.age > max_age and refreshes_here:
+            self.trigger(name)
+        return snapshot
+
+    async def _wait_for_leader(self, name: str) -> Optional[Snapshot]:
+        deadline = time.monotonic() + settings.snapshot_wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.snapshot_poll_interval)
+            snapshot = await snapshot_store.aget(name)
+            if snapshot is not None:
+                return snapshot
+        print(f"ERROR: No '{name}' snapshot from the leader after {settings.snapshot_wait_timeout}s")
+        return None
+
+    async def _loop(self, job: RefreshJob) -> None:
+        last_run = await asyncio.to_thread(job.last_run) if job.last_run else None
+        if last_run is None:
+            # A snapshot shared by a previous leader counts as the last run
+            snapshot = await snapshot_store.aget(job.name)
+            last_run = snapshot.updated_at if snapshot else None
+        if last_run is not None:
+            await asyncio.sleep(max(0.0, job.interval - (time.time() - last_run)))
+        while True:
+            await asyncio.shield(self.trigger(job.name))
+            await asyncio.sleep(job.interval)
+
+    def start(self) -> None:
+        self.is_leader = True
+        for job in self._jobs.values():
+            if job.interval > 0:
+                self._loops.append(asyncio.create_task(self._loop(job)))
+
+    async def stop(self) -> None:
+        tasks = self._loops + [
+            job.in_flight for job in self._jobs.values() if job.in_flight is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loops = []
+        for job in self._jobs.values():
+            job.in_flight = None
+
+
+scheduler = RefreshScheduler()
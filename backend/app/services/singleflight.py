@@ -0,0 +1,71 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+Publish = Callable[[Any], None]
+
+
+@dataclass
+class _Flight:
+    task: Optional[asyncio.Future] = None
+    results: List[Any] = field(default_factory=list)
+    listeners: List[Publish] = field(default_factory=list)
+
+    def publish(self, item: Any) -> None:
+        self.results.append(item)
+        for listener in list(self.listeners):
+            listener(item)
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls so they share one in-flight computation.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same result instead of starting their own. The key is
+    released as soon as the computation finishes, so later calls run fresh.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def _start(self, key: Hashable, factory: Callable[[_Flight], Awaitable[T]]) -> _Flight:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.ensure_future(factory(flight))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._flights.pop(key, None))
+        return flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._start(key, lambda _: fn())
+        # Shield so one caller disconnecting does not cancel the shared work
+        return await asyncio.shield(flight.task)
+
+    async def do_streaming(
+        self,
+        key: Hashable,
+        fn: Callable[[Publish], Awaitable[T]],
+        on_result: Optional[Publish] = None,
+    ) -> T:
+        """Like ``do`` for computations that publish partial results as they go.
+
+        Every caller's ``on_result`` sees every published item: late joiners
+        first get a replay of what was already published.
+        """
+        flight = self._start(key, lambda f: fn(f.publish))
+        if on_result is None:
+            return await asyncio.shield(flight.task)
+
+        for item in list(flight.results):
+            on_result(item)
+        flight.listeners.append(on_result)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.listeners.remove(on_result)
+
+
+flights = SingleFlight()
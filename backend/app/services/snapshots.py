@@ -0,0 +1,299 @@
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from app.config import settings
+from app.services.database import Database
+
+SNAPSHOT_KEY_PREFIX = "p2025:snapshot:"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """An immutable, versioned result published by a refresh job."""
+
+    data: Any
+    version: int
+    updated_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+
+class SnapshotStore:
+    """Latest snapshot per name; publishing swaps the reference atomically.
+
+    Snapshots live in this process only, which suits a single worker.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def register_model(self, name: str, model: Type[BaseModel]) -> None:
+        """Declare the model a snapshot holds (needed by shared stores to decode it)."""
+
+    def publish(self, name: str, data: Any) -> Snapshot:
+        with self._lock:
+            previous = self._snapshots.get(name)
+            snapshot = Snapshot(
+                data=data,
+                version=previous.version + 1 if previous else 1,
+                updated_at=time.time(),
+            )
+            self._snapshots[name] = snapshot
+        return snapshot
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        return self._snapshots.get(name)
+
+    async def apublish(self, name: str, data: Any) -> Snapshot:
+        """``publish`` for callers on the event loop."""
+        return self.publish(name, data)
+
+    async def aget(self, name: str) -> Optional[Snapshot]:
+        """``get`` for callers on the event loop."""
+        return self.get(name)
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            payload TEXT NOT NULL
+        );
+        """
+    )
+
+
+class SQLiteSnapshotBackend:
+    """Snapshot payloads in the shared SQLite database."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def write(self, name: str, payload: str, updated_at: float) -> int:
+        conn = self.db.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO snapshots (name, version, updated_at, payload) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET version = snapshots.version + 1, "
+                "updated_at = excluded.updated_at, payload = excluded.payload",
+                (name, updated_at, payload),
+            )
+            (version,) = conn.execute(
+                "SELECT version FROM snapshots WHERE name = ?", (name,)
+            ).fetchone()
+        return version
+
+    def head(self, name: str) -> Optional[Tuple[int, float]]:
+        row = self.db.connection().execute(
+            "SELECT version, updated_at FROM snapshots WHERE name = ?", (name,)
+        ).fetchone()
+        return (row["version"], row["updated_at"]) if row else None
+
+    def read(self, name: str) -> Optional[Tuple[int, float, str]]:
+        row = self.db.connection().execute(
+            "SELECT version, updated_at, payload FROM snapshots WHERE name = ?", (name,)
+        ).fetchone()
+        return (row["version"], row["updated_at"], row["payload"]) if row else None
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisSnapshotBackend:
+    """Snapshot payloads in Redis hashes.
+
+    The version is a counter field of the same hash, bumped in the
+    MULTI/EXEC transaction that writes the payload, so readers never see a
+    version paired with another write's payload.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def write(self, name: str, payload: str, updated_at: float) -> int:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hincrby(SNAPSHOT_KEY_PREFIX + name, "version", 1)
+        pipe.hset(SNAPSHOT_KEY_PREFIX + name, mapping={"updated_at": updated_at, "payload": payload})
+        version, _ = pipe.execute()
+        return int(version)
+
+    def head(self, name: str) -> Optional[Tuple[int, float]]:
+        version, updated_at = self.client.hmget(
+            SNAPSHOT_KEY_PREFIX + name, ["version", "updated_at"]
+        )
+        if version is None:
+            return None
+        return int(version), float(updated_at)
+
+    def read(self, name: str) -> Optional[Tuple[int, float, str]]:
+        version, updated_at, payload = self.client.hmget(
+            SNAPSHOT_KEY_PREFIX + name, ["version", "updated_at", "payload"]
+        )
+        if version is None:
+            return None
+        return int(version), float(updated_at), _text(payload)
+
+
+class LocalRedis:
+    """In-process stand-in for the few Redis commands the snapshot backend uses.
+
+    Selected with ``REDIS_URL=memory://`` for tests and local runs.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def pipeline(self, transaction: bool = True) -> "_LocalPipeline":
+        return _LocalPipeline(self)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        with self._lock:
+            fields = self._data.setdefault(key, {})
+            value = int(fields.get(field, 0)) + amount
+            fields[field] = str(value).encode("utf-8")
+            return value
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        with self._lock:
+            fields = self._data.setdefault(key, {})
+            added = len(set(mapping) - set(fields))
+            fields.update({field: str(value).encode("utf-8") for field, value in mapping.items()})
+            return added
+
+    def hmget(self, key: str, fields: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            stored = self._data.get(key, {})
+            return [stored.get(field) for field in fields]
+
+
+class _LocalPipeline:
+    """Queued commands that run together under the store's lock, like MULTI/EXEC."""
+
+    def __init__(self, redis: LocalRedis):
+        self._redis = redis
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> "_LocalPipeline":
+        self._commands.append(("hincrby", (key, field, amount), {}))
+        return self
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> "_LocalPipeline":
+        self._commands.append(("hset", (key,), {"mapping": mapping}))
+        return self
+
+    def execute(self) -> List[Any]:
+        with self._redis._lock:
+            results = [
+                getattr(self._redis, command)(*args, **kwargs)
+                for command, args, kwargs in self._commands
+            ]
+        self._commands = []
+        return results
+
+
+class SharedSnapshotStore(SnapshotStore):
+    """Snapshots serialized into a backend every worker process can read.
+
+    Each read only checks the stored version; the payload is fetched and
+    decoded again only after another process has published a new one.
+    The async methods run that I/O and (de)serialization in a worker thread.
+    """
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self._models: Dict[str, Type[BaseModel]] = {}
+
+    def register_model(self, name: str, model: Type[BaseModel]) -> None:
+        self._models[name] = model
+
+    def _encode(self, data: Any) -> str:
+        if isinstance(data, BaseModel):
+            return data.model_dump_json()
+        return json.dumps(data)
+
+    def _decode(self, name: str, payload: str) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model.model_validate_json(payload)
+        return json.loads(payload)
+
+    def publish(self, name: str, data: Any) -> Snapshot:
+        updated_at = time.time()
+        try:
+            version = self.backend.write(name, self._encode(data), updated_at)
+        except Exception as e:
+            print(f"ERROR: Could not share snapshot '{name}': {e}")
+            previous = self._snapshots.get(name)
+            version = previous.version + 1 if previous else 1
+        snapshot = Snapshot(data=data, version=version, updated_at=updated_at)
+        with self._lock:
+            self._snapshots[name] = snapshot
+        return snapshot
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        try:
+            head = self.backend.head(name)
+        except Exception as e:
+            # A backend outage degrades to this process's last known copy
+            print(f"ERROR: Snapshot backend unavailable for '{name}': {e}")
+            return self._snapshots.get(name)
+        if head is None:
+            return None
+        cached = self._snapshots.get(name)
+        if cached is not None and cached.version == head[0]:
+            return cached
+
+        stored = self.backend.read(name)
+        if stored is None:
+            return None
+        version, updated_at, payload = stored
+        snapshot = Snapshot(data=self._decode(name, payload), version=version, updated_at=updated_at)
+        with self._lock:
+            self._snapshots[name] = snapshot
+        return snapshot
+
+    async def apublish(self, name: str, data: Any) -> Snapshot:
+        return await asyncio.to_thread(self.publish, name, data)
+
+    async def aget(self, name: str) -> Optional[Snapshot]:
+        return await asyncio.to_thread(self.get, name)
+
+
+def _redis_client():
+    if settings.redis_url.startswith("memory://"):
+        return LocalRedis()
+    try:
+        import redis
+    except ImportError:
+        print("ERROR: SNAPSHOT_BACKEND=redis requires the 'redis' package; using SQLite")
+        return None
+    return redis.Redis.from_url(settings.redis_url)
+
+
+def build_snapshot_store() -> SnapshotStore:
+    """The snapshot store selected by SNAPSHOT_BACKEND (memory, sqlite or redis)."""
+    if settings.snapshot_backend == "memory":
+        return SnapshotStore()
+    if settings.snapshot_backend == "redis":
+        client = _redis_client()
+        if client is not None:
+            return SharedSnapshotStore(RedisSnapshotBackend(client))
+    return SharedSnapshotStore(
+        SQLiteSnapshotBackend(Database(settings.database_path, init_schema=_init_schema))
+    )
+
+
+snapshot_store = build_snapshot_store()
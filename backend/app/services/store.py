@@ -0,0 +1,186 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.services.ai_service import AGENDA_CATEGORIES
+from app.services.articles import article_id
+from app.services.database import Database
+
+DEFAULT_PROGRESS = 50
+DAY_SECONDS = 86400
+# Unix day 0 was a Thursday; shifting by 3 days aligns weekly buckets to Monday
+WEEK_OFFSET_DAYS = 3
+
+
+def _init_schema(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS progress_current (
+            category TEXT PRIMARY KEY,
+            progress INTEGER NOT NULL,
+            last_updated TEXT,
+            articles TEXT NOT NULL DEFAULT '[]',
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS progress_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category TEXT NOT NULL,
+            recorded_at REAL NOT NULL,
+            progress INTEGER NOT NULL,
+            article_ids TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_progress_history_category_time
+            ON progress_history (category, recorded_at, progress);
+        CREATE TABLE IF NOT EXISTS evidence_fingerprints (
+            kind TEXT NOT NULL,
+            item TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            result TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, item)
+        );
+        """
+    )
+
+
+def _default_entry() -> Dict:
+    return {"progress": DEFAULT_PROGRESS, "last_updated": None, "articles": []}
+
+
+class ProgressStore:
+    """Category progress persisted in SQLite, shared by every worker process."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get(self, category: str) -> Dict:
+        row = self.db.connection().execute(
+            "SELECT progress, last_updated, articles FROM progress_current WHERE category = ?",
+            (category,),
+        ).fetchone()
+        if row is None:
+            return _default_entry()
+        return {
+            "progress": row["progress"],
+            "last_updated": row["last_updated"],
+            "articles": json.loads(row["articles"]),
+        }
+
+    def all(self) -> Dict[str, Dict]:
+        """Current values for every agenda category, read in one consistent query."""
+        rows = self.db.connection().execute(
+            "SELECT category, progress, last_updated, articles FROM progress_current"
+        ).fetchall()
+        stored = {
+            row["category"]: {
+                "progress": row["progress"],
+                "last_updated": row["last_updated"],
+                "articles": json.loads(row["articles"]),
+            }
+            for row in rows
+        }
+        return {category: stored.get(category, _default_entry()) for category in AGENDA_CATEGORIES}
+
+    def replace_all(self, results: Dict[str, Dict]) -> None:
+        """Swap in a full analysis run atomically and append one history row per category."""
+        now = time.time()
+        conn = self.db.connection()
+        with conn:
+            for category, data in results.items():
+                articles = json.dumps(data.get("articles", []))
+                conn.execute(
+                    "INSERT INTO progress_current (category, progress, last_updated, articles, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(category) DO UPDATE SET progress = excluded.progress, "
+                    "last_updated = excluded.last_updated, articles = excluded.articles, "
+                    "updated_at = excluded.updated_at",
+                    (category, data["progress"], data["last_updated"], articles, now),
+                )
+                article_ids = ",".join(
+                    article_id(a["url"]) for a in data.get("articles", []) if a.get("url")
+                )
+                conn.execute(
+                    "INSERT INTO progress_history (category, recorded_at, progress, article_ids) "
+                    "VALUES (?, ?, ?, ?)",
+                    (category, now, data["progress"], article_ids),
+                )
+
+    def last_analyzed_at(self) -> Optional[float]:
+        (value,) = self.db.connection().execute(
+            "SELECT MAX(updated_at) FROM progress_current"
+        ).fetchone()
+        return value
+
+    def history(self, category: str, start: float, end: float, bucket: str = "raw") -> List[Dict]:
+        """Progress samples for a category in [start, end], optionally averaged per day/week.
+
+        The range scan is served entirely from the (category, recorded_at,
+        progress) index, so long windows do not touch the table rows.
+        """
+        conn = self.db.connection()
+        if bucket == "raw":
+            rows = conn.execute(
+                "SELECT recorded_at AS bucket_start, progress, 1 AS samples "
+                "FROM progress_history WHERE category = ? AND recorded_at BETWEEN ? AND ? "
+                "ORDER BY recorded_at",
+                (category, start, end),
+            ).fetchall()
+        else:
+            days = 7 if bucket == "weekly" else 1
+            offset = WEEK_OFFSET_DAYS if bucket == "weekly" else 0
+            rows = conn.execute(
+                "SELECT ((CAST(recorded_at / ? AS INTEGER) + ?) / ? * ? - ?) * ? AS bucket_start, "
+                "AVG(progress) AS progress, COUNT(*) AS samples "
+                "FROM progress_history WHERE category = ? AND recorded_at BETWEEN ? AND ? "
+                "GROUP BY bucket_start ORDER BY bucket_start",
+                (DAY_SECONDS, offset, days, days, offset, DAY_SECONDS, category, start, end),
+            ).fetchall()
+        return [
+            {
+                "timestamp": row["bucket_start"],
+                "progress": round(row["progress"], 1),
+                "samples": row["samples"],
+            }
+            for row in rows
+        ]
+
+
+class EvidenceStore:
+    """Last evidence fingerprint and result per analyzed item.
+
+    Lets a re-run skip the LLM for categories and predictions whose news has
+    not changed since they were last scored.
+    """
+
+    def __init__(self, db: Database, max_age: int):
+        self.db = db
+        self.max_age = max_age
+
+    def lookup(self, kind: str, item: str, fingerprint: str) -> Optional[Any]:
+        """The stored result if it was produced from the same evidence, else None."""
+        row = self.db.connection().execute(
+            "SELECT fingerprint, result, updated_at FROM evidence_fingerprints "
+            "WHERE kind = ? AND item = ?",
+            (kind, item),
+        ).fetchone()
+        if row is None or row["fingerprint"] != fingerprint:
+            return None
+        if time.time() - row["updated_at"] > self.max_age:
+            return None
+        return json.loads(row["result"])
+
+    def record(self, kind: str, item: str, fingerprint: str, result: Any) -> None:
+        conn = self.db.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO evidence_fingerprints (kind, item, fingerprint, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(kind, item) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "result = excluded.result, updated_at = excluded.updated_at",
+                (kind, item, fingerprint, json.dumps(result), time.time()),
+            )
+
+
+database = Database(settings.database_path, init_schema=_init_schema)
+progress_store = ProgressStore(database)
+evidence_store = EvidenceStore(database, settings.evidence_max_age)
@@ -0,0 +1,166 @@
+"""Latency benchmark for the API's hot endpoints.
+
+Drives each endpoint at a fixed concurrency for a number of requests and
+reports p50/p95/p99 latency and throughput. By default the app runs
+in-process against the offline fake providers (no network access needed):
+
+    python -m bench.benchmark --requests 200 --concurrency 16
+
+Use --url to benchmark a running server instead, and --max-p95-ms to fail
+(exit code 1) when any endpoint regresses past a latency budget in CI.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+ENDPOINTS: List[Tuple[str, str]] = [
+    ("GET", "/api/geopolitical"),
+    ("GET", "/api/report/pdf"),
+    ("POST", "/api/progress/analyze"),
+    ("POST", "/api/predictions/score"),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient, method: str, path: str, requests: int, concurrency: int
+) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "endpoint": f"{method} {path}",
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "req_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def configure_offline_environment(data_dir: str, args: argparse.Namespace) -> None:
+    """Point the app at fake providers and a throwaway database before it is imported."""
+    os.environ.setdefault("PROVIDER_MODE", "fake")
+    os.environ.setdefault("SCHEDULER_ENABLED", "false")
+    os.environ["DATABASE_PATH"] = os.path.join(data_dir, "tracker.sqlite3")
+    os.environ["AI_CACHE_PATH"] = os.path.join(data_dir, "ai_cache.sqlite3")
+    if args.cold:
+        # Every run must reach the pipelines: no cached answers, evidence or retrievals
+        os.environ["AI_CACHE_ENABLED"] = "false"
+        os.environ["EVIDENCE_MAX_AGE"] = "0"
+        os.environ["NEWS_RETRIEVAL_TTL"] = "0"
+    if args.error_rate is not None:
+        os.environ["FAKE_ERROR_RATE"] = str(args.error_rate)
+    if args.llm_latency_ms is not None:
+        os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+
+
+async def benchmark(args: argparse.Namespace) -> List[Dict]:
+    endpoints = [e for e in ENDPOINTS if not args.only or e[1] in args.only]
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            return [
+                await run_endpoint(client, method, path, args.requests, args.concurrency)
+                for method, path in endpoints
+            ]
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=args.timeout
+        ) as client:
+            # One warm-up pass so the first measured request is not a cold start
+            for method, path in endpoints:
+                await client.request(method, path)
+            return [
+                await run_endpoint(client, method, path, args.requests, args.concurrency)
+                for method, path in endpoints
+            ]
+
+
+def print_table(results: List[Dict]) -> None:
+    header = f"{'endpoint':32} {'reqs':>6} {'errs':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['endpoint']:32} {r['requests']:>6} {r['errors']:>5} "
+            f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['req_per_s']:>9.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--only", nargs="*", help="limit to these endpoint paths")
+    parser.add_argument(
+        "--cold", action="store_true",
+        help="disable the AI result cache, evidence reuse and retrieval reuse",
+    )
+    parser.add_argument("--error-rate", type=float, help="fake provider transient error rate")
+    parser.add_argument("--llm-latency-ms", type=float, help="fake LLM mean latency")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any endpoint's p95 exceeds this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        if not args.url:
+            configure_offline_environment(data_dir, args)
+        results = asyncio.run(benchmark(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.max_p95_ms is not None:
+        slow = [r for r in results if r["p95_ms"] > args.max_p95_ms]
+        for r in slow:
+            print(f"FAIL: {r['endpoint']} p95 {r['p95_ms']}ms > {args.max_p95_ms}ms", file=sys.stderr)
+        if slow:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+import pytest
+
+# Settings are read when the app is first imported, so point every store at
+# a scratch directory and switch to the offline providers before that.
+_data_dir = tempfile.mkdtemp(prefix="project2025watch-tests-")
+os.environ.update({
+    "PROVIDER_MODE": "fake",
+    "FAKE_NEWS_LATENCY_MS": "0",
+    "FAKE_FEED_LATENCY_MS": "0",
+    "FAKE_LLM_LATENCY_MS": "0",
+    "DATABASE_PATH": os.path.join(_data_dir, "tracker.sqlite3"),
+    "AI_CACHE_PATH": os.path.join(_data_dir, "ai_cache.sqlite3"),
+    "LEADER_LOCK_PATH": os.path.join(_data_dir, "scheduler.lock"),
+    "SCHEDULER_ENABLED": "false",
+    "ALERT_WEBHOOK_URL": "",
+})
+
+
+class Clock:
+    """A settable stand-in for ``time.time``."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock(time.time())
+    monkeypatch.setattr(time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def progress_db():
+    """The shared progress store, emptied before each test."""
+    from app.services.store import progress_store
+
+    conn = progress_store.db.connection()
+    with conn:
+        conn.execute("DELETE FROM progress_current")
+        conn.execute("DELETE FROM progress_history")
+    return progress_store
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from app.services.alerts import (
+    ALERT_CLEARED,
+    ALERT_RULES,
+    ALERT_TRIGGERED,
+    AlertEngine,
+    _init_schema,
+    compile_rules,
+)
+from app.services.database import Database
+from app.services.store import DAY_SECONDS
+
+
+@pytest.fixture
+def engine(tmp_path, progress_db):
+    db = Database(str(tmp_path / "alerts.sqlite3"), init_schema=_init_schema)
+    return AlertEngine(db, compile_rules(ALERT_RULES), hysteresis=5.0)
+
+
+def ingest(engine, values):
+    return [(e["rule"], e["state"]) for e in asyncio.run(engine.ingest(values))]
+
+
+def record(store, values):
+    """Persist an analysis run the way progress_service does."""
+    store.replace_all({
+        category: {"progress": progress, "last_updated": None, "articles": []}
+        for category, progress in values.items()
+    })
+
+
+def test_level_rule_triggers_and_clears_below_hysteresis(engine):
+    assert ingest(engine, {"Federal Agency Capture": 80}) == [
+        ("federal_agency_capture", ALERT_TRIGGERED)
+    ]
+    # Within the hysteresis band the alert stays active
+    assert ingest(engine, {"Federal Agency Capture": 77}) == []
+    assert ingest(engine, {"Federal Agency Capture": 74}) == [
+        ("federal_agency_capture", ALERT_CLEARED)
+    ]
+    _, active = engine.status()
+    assert active == []
+
+
+def test_unchanged_values_produce_no_events(engine):
+    ingest(engine, {"Judicial Defiance": 71})
+    assert ingest(engine, {"Judicial Defiance": 71}) == []
+    assert [e["rule"] for e in engine.events_after(0)] == ["judicial_defiance"]
+
+
+def test_compound_rule_needs_every_condition(engine):
+    assert ingest(engine, {"Judicial Defiance": 65, "Media Subversion": 40}) == []
+    assert ingest(engine, {"Media Subversion": 61}) == [
+        ("press_and_courts_under_pressure", ALERT_TRIGGERED)
+    ]
+    _, active = engine.status()
+    assert [a["rule_id"] for a in active] == ["press_and_courts_under_pressure"]
+
+
+def test_windowed_rule_clears_once_the_rise_leaves_the_window(engine, progress_db, clock):
+    category = "Suppression of Dissent"
+    record(progress_db, {category: 40})
+    assert ingest(engine, {category: 40}) == []
+
+    clock.advance(DAY_SECONDS)
+    record(progress_db, {category: 60})
+    assert ingest(engine, {category: 60}) == [
+        ("dissent_crackdown_escalating", ALERT_TRIGGERED)
+    ]
+
+    # No new analysis: the value stays flat while the 40 ages out of the window
+    clock.advance(3 * DAY_SECONDS)
+    assert ingest(engine, {}) == []
+    clock.advance(5 * DAY_SECONDS)
+    assert ingest(engine, {}) == [("dissent_crackdown_escalating", ALERT_CLEARED)]
+
+
+def test_compile_rules_rejects_bad_specs():
+    with pytest.raises(ValueError):
+        compile_rules([{"id": "x", "message": "", "when": [{"category": "Nope", "at_least": 1}]}])
+    with pytest.raises(ValueError):
+        compile_rules([{"id": "x", "message": "", "when": [{"category": "Media Subversion"}]}])
+    with pytest.raises(ValueError):
+        compile_rules(ALERT_RULES[:1] * 2)
+
+
+def test_windowed_baseline_ignores_a_single_outlying_sample(engine, progress_db, clock):
+    category = "Suppression of Dissent"
+    for progress in (62, 0, 62, 64):
+        clock.advance(DAY_SECONDS)
+        record(progress_db, {category: progress})
+        assert ingest(engine, {category: progress}) == []
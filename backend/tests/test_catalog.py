@@ -0,0 +1,71 @@
+from app.models.schemas import Prediction
+from app.services.catalog import DEFAULT_STATUS, PredictionCatalog
+
+
+def make_catalog():
+    return PredictionCatalog(
+        Prediction(
+            id=i,
+            timeframe="2025" if i % 2 else "2026",
+            prediction=f"Prediction {i}",
+            category="Courts" if i % 3 == 0 else "Agencies",
+            result=DEFAULT_STATUS,
+            news_match="",
+        )
+        # Out of order on purpose: the catalog keeps ids sorted
+        for i in [5, 1, 4, 2, 3, 6, 7, 8, 9, 10]
+    )
+
+
+def ids(page):
+    return [p.id for p in page]
+
+
+def test_query_pages_with_a_cursor():
+    catalog = make_catalog()
+    page, cursor = catalog.query({}, limit=4)
+    assert ids(page) == [1, 2, 3, 4] and cursor == 4
+    page, cursor = catalog.query({}, after=cursor, limit=4)
+    assert ids(page) == [5, 6, 7, 8] and cursor == 8
+    page, cursor = catalog.query({}, after=cursor, limit=4)
+    assert ids(page) == [9, 10] and cursor is None
+
+
+def test_query_combines_filters():
+    catalog = make_catalog()
+    page, cursor = catalog.query({"timeframe": "2025", "category": "Courts", "result": None})
+    assert ids(page) == [3, 9] and cursor is None
+    assert catalog.query({"category": "Unknown"}) == ([], None)
+
+
+def test_apply_moves_predictions_between_status_indexes():
+    catalog = make_catalog()
+    scored = [
+        p.model_copy(update={"result": "In Progress", "news_match": "match"})
+        for p in catalog.get_many([2, 9])
+    ]
+    catalog.apply(scored)
+
+    page, _ = catalog.query({"result": "In Progress"})
+    assert ids(page) == [2, 9]
+    assert all(p.news_match == "match" for p in page)
+    assert 2 not in catalog.ids_matching({"result": DEFAULT_STATUS})
+    # Fields other than the score are kept from the catalog
+    assert catalog.get_many([9])[0].prediction == "Prediction 9"
+
+
+def test_apply_ignores_unknown_ids():
+    catalog = make_catalog()
+    catalog.apply([Prediction(id=99, timeframe="x", prediction="x", result="Done", news_match="")])
+    assert len(catalog) == 10
+    assert catalog.query({"result": "Done"}) == ([], None)
+
+
+def test_sync_applies_each_marker_once():
+    catalog = make_catalog()
+    done = catalog.get_many([1])[0].model_copy(update={"result": "Done"})
+    catalog.sync((1,), [done])
+    catalog.apply([done.model_copy(update={"result": DEFAULT_STATUS})])
+    # Same marker: the published scores are not applied again
+    catalog.sync((1,), [done])
+    assert catalog.get_many([1])[0].result == DEFAULT_STATUS
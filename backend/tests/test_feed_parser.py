@@ -0,0 +1,83 @@
+import asyncio
+import datetime
+import pytest
+from app.config import settings
+from app.providers.fake import FakeFeedProvider, LatencyProfile
+from app.services.feed_parser import iter_feed_items
+from app.services.rss_service import FeedState, _new_items
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>Newest</title><link>https://example.com/3</link><guid>g3</guid>
+<description>third</description><pubDate>Wed, 08 Jan 2025 12:00:00 GMT</pubDate></item>
+<item><title>Middle</title><link>https://example.com/2</link><guid>g2</guid>
+<pubDate>Tue, 07 Jan 2025 12:00:00 GMT</pubDate></item>
+<item><title>Oldest</title><link>https://example.com/1</link><guid>g1</guid>
+<pubDate>Mon, 06 Jan 2025 12:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">
+<entry><title>Atom item</title><id>urn:a1</id>
+<link rel="self" href="https://example.com/self"/>
+<link href="https://example.com/a1"/>
+<summary>s</summary><updated>2025-01-08T12:00:00Z</updated></entry>
+</feed>"""
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def collect(items):
+    async def run():
+        return [item async for item in items]
+    return asyncio.run(run())
+
+
+def test_iter_feed_items_parses_across_chunk_boundaries():
+    items = collect(iter_feed_items(_chunks(RSS, 7)))
+    assert [item["guid"] for item in items] == ["g3", "g2", "g1"]
+    assert items[0]["summary"] == "third"
+    assert items[0]["published"] == datetime.datetime(2025, 1, 8, 12, tzinfo=datetime.timezone.utc)
+    assert items[0]["date"] == "2025-01-08"
+
+
+def test_iter_feed_items_reads_atom_alternate_link():
+    (item,) = collect(iter_feed_items(_chunks(ATOM, 64)))
+    assert item["link"] == "https://example.com/a1"
+    assert item["guid"] == "urn:a1"
+
+
+def test_iter_feed_items_reads_fake_provider_feed():
+    provider = FakeFeedProvider(LatencyProfile(0, 0, 0, seed=0), items=25)
+
+    async def run():
+        async with provider.stream("https://feeds.example/rss", None, None) as response:
+            return [item async for item in iter_feed_items(response.chunks)]
+
+    items = asyncio.run(run())
+    assert len(items) == 25
+    assert [item["title"].rsplit("#", 1)[1] for item in items[:3]] == ["0", "1", "2"]
+
+
+def test_new_items_stops_at_last_seen_guid():
+    state = FeedState(last_guid="g2")
+    assert [i["guid"] for i in collect(_new_items(_chunks(RSS, 50), state))] == ["g3"]
+
+
+def test_new_items_stops_at_older_item():
+    state = FeedState(
+        last_published=datetime.datetime(2025, 1, 7, 18, tzinfo=datetime.timezone.utc)
+    )
+    assert [i["guid"] for i in collect(_new_items(_chunks(RSS, 50), state))] == ["g3"]
+
+
+def test_new_items_reads_everything_on_first_fetch(monkeypatch):
+    assert len(collect(_new_items(_chunks(RSS, 50), FeedState()))) == 3
+    monkeypatch.setattr(settings, "rss_max_items_per_feed", 2)
+    assert len(collect(_new_items(_chunks(RSS, 50), FeedState()))) == 2
+
+
+def test_iter_feed_items_raises_on_malformed_xml():
+    with pytest.raises(Exception):
+        collect(iter_feed_items(_chunks(b"<rss><channel><item></channel>", 8)))
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.services.database import Database
+from app.services.jobs import JOB_COMPLETED, JOB_FAILED, Job, JobManager, JobStore, _init_schema
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "job_poll_interval", 0.01)
+    return JobStore(Database(str(tmp_path / "jobs.sqlite3"), init_schema=_init_schema))
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def test_other_workers_replay_a_finished_job(store):
+    async def runner(job):
+        for i in range(3):
+            job.emit("item", {"n": i})
+
+    async def run():
+        owner, other = JobManager(store), JobManager(store)
+        job = await owner.start("test", runner)
+        await job._task
+        copy = await other.get(job.id)
+        return copy, await _collect(copy.follow(after=0))
+
+    copy, events = asyncio.run(run())
+    assert not copy.local and copy.status == JOB_COMPLETED and copy.item_count == 3
+    assert [e["event"] for e in events] == ["item", "item", "done"]
+    assert [e["id"] for e in events] == [1, 2, 3]
+
+
+def test_followers_fail_a_job_whose_worker_stopped(store, monkeypatch):
+    monkeypatch.setattr(settings, "job_heartbeat_timeout", 0.05)
+
+    async def run():
+        # Stored as running by a worker that then went away without a heartbeat
+        job = Job(id="orphan", kind="test")
+        store.create(job, prune_before=0)
+        store.append(job, [{"id": 0, "event": "item", "data": {}}])
+        copy = await JobManager(store).get("orphan")
+        return await asyncio.wait_for(_collect(copy.follow()), timeout=5)
+
+    events = asyncio.run(run())
+    assert [e["event"] for e in events] == ["item", "failed"]
+    assert events[-1]["data"]["status"] == JOB_FAILED
+    assert store.load("orphan")["status"] == JOB_FAILED
+
+
+def test_heartbeat_keeps_a_slow_job_alive(store, monkeypatch):
+    monkeypatch.setattr(settings, "job_heartbeat_interval", 0.02)
+    monkeypatch.setattr(settings, "job_heartbeat_timeout", 0.1)
+
+    async def runner(job):
+        await asyncio.sleep(0.3)
+        job.emit("item", {})
+
+    async def run():
+        job = await JobManager(store).start("test", runner)
+        copy = await JobManager(store).get(job.id)
+        return await asyncio.wait_for(_collect(copy.follow()), timeout=5)
+
+    events = asyncio.run(run())
+    assert [e["event"] for e in events] == ["item", "done"]
+
+
+def test_idle_streams_yield_keepalives(store, monkeypatch):
+    monkeypatch.setattr(settings, "job_keepalive_interval", 0.02)
+
+    async def runner(job):
+        await asyncio.sleep(0.1)
+        job.emit("item", {})
+
+    async def run():
+        job = await JobManager(store).start("test", runner)
+        copy = await JobManager(store).get(job.id)
+        local, stored = await asyncio.gather(_collect(job.follow()), _collect(copy.follow()))
+        return local, stored
+
+    for events in asyncio.run(run()):
+        assert events[0] is None
+        assert [e["event"] for e in events if e is not None] == ["item", "done"]
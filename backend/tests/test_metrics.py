@@ -0,0 +1,36 @@
+import json
+from app.services import metrics
+from app.services.metrics import Counter, Histogram
+
+
+def test_counters_and_histograms_sum_across_workers():
+    counter = Counter("c_total", "c", ("kind",))
+    histogram = Histogram("h_seconds", "h", ("kind",), buckets=(1.0, 5.0))
+    counter.inc("a", amount=2)
+    histogram.observe(0.5, "a")
+    other = Counter("c_total", "c", ("kind",))
+    other.inc("a")
+    other.inc("b")
+    other_histogram = Histogram("h_seconds", "h", ("kind",), buckets=(1.0, 5.0))
+    other_histogram.observe(3.0, "a")
+
+    # Round-trip through JSON, as the shared store does
+    exports = json.loads(json.dumps([counter.export(), other.export()]))
+    assert counter.combine(exports) == {("a",): 3.0, ("b",): 1.0}
+
+    lines = histogram.render(histogram.combine([histogram.export(), other_histogram.export()]))
+    assert 'h_seconds_bucket{kind="a",le="1.0"} 1' in lines
+    assert 'h_seconds_bucket{kind="a",le="5.0"} 2' in lines
+    assert 'h_seconds_count{kind="a"} 2' in lines
+
+
+def test_render_all_includes_other_workers(monkeypatch):
+    name = metrics.cache_requests.name
+    conn = metrics.metrics_store.db.connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO metric_totals (worker, totals, updated_at) VALUES (?, ?, ?)",
+            ("other-worker", json.dumps({name: [[["test", "hit"], 5.0]]}), 4e9),
+        )
+    metrics.cache_requests.inc("test", "hit", amount=2)
+    assert f'{name}{{cache="test",result="hit"}} 7.0' in metrics.render_all().splitlines()
@@ -0,0 +1,24 @@
+from app.config import settings
+from app.services.catalog import prediction_catalog
+from app.services.prediction_service import scheduled_prediction_ids
+
+
+def test_scheduled_slices_rotate_through_the_catalog(monkeypatch, clock):
+    interval = 3600
+    monkeypatch.setattr(settings, "predictions_refresh_interval", interval)
+    monkeypatch.setattr(settings, "predictions_refresh_batch", 3)
+    all_ids = {p.id for p in prediction_catalog.all()}
+    assert len(all_ids) > 3
+
+    seen = set()
+    for _ in range(-(-len(all_ids) // 3)):
+        due = scheduled_prediction_ids()
+        assert len(due) == 3
+        seen.update(due)
+        clock.advance(interval)
+    assert seen == all_ids
+
+
+def test_batch_of_zero_schedules_the_whole_catalog(monkeypatch):
+    monkeypatch.setattr(settings, "predictions_refresh_batch", 0)
+    assert scheduled_prediction_ids() == [p.id for p in prediction_catalog.all()]
@@ -0,0 +1,35 @@
+from app.services.retrieval import RetrievalPlanner, plan_queries, query_terms
+
+
+def article(title, description=""):
+    return {"title": title, "description": description}
+
+
+def test_query_terms_drop_stopwords_and_repeats():
+    assert query_terms("Trump and the NATO alliance, NATO withdrawal") == [
+        "trump", "nato", "alliance", "withdrawal"
+    ]
+
+
+def test_plan_queries_respects_the_length_limit():
+    plans = plan_queries(["aaa bbb", "ccc", "ddd eee"], max_chars=20)
+    assert plans == ["(aaa bbb) OR (ccc)", "(ddd eee)"]
+
+
+def test_route_ranks_articles_by_share_of_matched_terms():
+    planner = RetrievalPlanner()
+    planner.register("nato", "NATO withdrawal")
+    planner.register("courts", "court order")
+    articles = [
+        article("NATO summit opens"),
+        article("Alliance members fear withdrawal", "NATO officials said"),
+        article("Judge says court order ignored"),
+        article("Weather report"),
+        # Whole words only: "courtyard" is not "court"
+        article("Courtyard concert"),
+    ]
+    routed = planner.route(articles, ["nato", "courts"])
+    assert [a["title"] for a in routed["nato"]] == [
+        "Alliance members fear withdrawal", "NATO summit opens"
+    ]
+    assert [a["title"] for a in routed["courts"]] == ["Judge says court order ignored"]
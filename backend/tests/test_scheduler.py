@@ -0,0 +1,22 @@
+import asyncio
+from app.services.scheduler import RefreshScheduler
+
+
+def test_followers_refresh_on_demand_jobs_themselves():
+    scheduler = RefreshScheduler()
+    scheduler.is_leader = False
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    # Interval 0: the leader never runs it on its own, so nobody would publish
+    scheduler.register("test_on_demand", refresh, interval=0)
+
+    async def run():
+        return await asyncio.wait_for(scheduler.get_snapshot("test_on_demand"), timeout=5)
+
+    snapshot = asyncio.run(run())
+    assert snapshot.data == {"value": 1}
+    assert calls == [1]
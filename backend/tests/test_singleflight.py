@@ -0,0 +1,73 @@
+import asyncio
+from app.services.singleflight import SingleFlight
+
+
+def test_do_shares_one_call_between_concurrent_callers():
+    flights = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        first = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+        # The key is released once the call finishes
+        second = await flights.do("k", work)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == [1] * 5
+    assert second == 2
+
+
+def test_do_streaming_replays_published_items_to_late_joiners():
+    flights = SingleFlight()
+    halfway = None
+    release = None
+
+    async def work(publish):
+        publish("a")
+        publish("b")
+        halfway.set()
+        await release.wait()
+        publish("c")
+        return "result"
+
+    async def run():
+        nonlocal halfway, release
+        halfway, release = asyncio.Event(), asyncio.Event()
+        early, late = [], []
+        first = asyncio.ensure_future(flights.do_streaming("k", work, early.append))
+        await halfway.wait()
+        second = asyncio.ensure_future(flights.do_streaming("k", work, late.append))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second)
+        return results, early, late
+
+    results, early, late = asyncio.run(run())
+    assert results == ["result", "result"]
+    assert early == ["a", "b", "c"]
+    assert late == ["a", "b", "c"]
+
+
+def test_do_streaming_shares_failures():
+    flights = SingleFlight()
+
+    async def work(publish):
+        publish(1)
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            flights.do_streaming("k", work, lambda _: None),
+            flights.do_streaming("k", work),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
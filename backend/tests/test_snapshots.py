@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.models.schemas import ProgressItem, ProgressList
+from app.services.database import Database
+from app.services.snapshots import (
+    LocalRedis,
+    RedisSnapshotBackend,
+    SharedSnapshotStore,
+    SQLiteSnapshotBackend,
+    _init_schema,
+)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteSnapshotBackend(Database(str(tmp_path / "snapshots.sqlite3"), init_schema=_init_schema))
+    return RedisSnapshotBackend(LocalRedis())
+
+
+def progress(value):
+    return ProgressList(items=[ProgressItem(title="x", progress=value, last_updated="2025-01-01", articles=[])])
+
+
+def test_workers_see_each_others_snapshots(backend):
+    writer, reader = SharedSnapshotStore(backend), SharedSnapshotStore(backend)
+    for store in (writer, reader):
+        store.register_model("progress", ProgressList)
+
+    async def run():
+        assert await reader.aget("progress") is None
+        first = await writer.apublish("progress", progress(10))
+        seen = await reader.aget("progress")
+        assert (seen.version, seen.data) == (first.version, progress(10))
+        await writer.apublish("progress", progress(20))
+        return await reader.aget("progress")
+
+    latest = asyncio.run(run())
+    assert latest.version == 2
+    assert latest.data.items[0].progress == 20
+
+
+def test_concurrent_writes_get_distinct_versions(backend):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = list(pool.map(lambda i: backend.write("s", str(i), float(i)), range(40)))
+    assert sorted(versions) == list(range(1, 41))
+    version, _, payload = backend.read("s")
+    assert version == 40
+    # The payload stored with the last version is the one that wrote it
+    assert versions[int(payload)] == version
@@ -1,14 +1,23 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
-import { fetchAlerts } from "@/lib/api";
+import { useEffect } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { fetchAlerts, subscribeAlerts } from "@/lib/api";
 
 export function EmergencyAlert() {
+  const queryClient = useQueryClient();
   const { data } = useQuery({
     queryKey: ["alerts"],
     queryFn: fetchAlerts,
+    // Updates are pushed over the alert stream, so never refetch on a timer or focus
+    staleTime: Infinity,
   });
 
+  useEffect(
+    () => subscribeAlerts((status) => queryClient.setQueryData(["alerts"], status)),
+    [queryClient]
+  );
+
   if (!data?.triggered) return null;
 
   return (
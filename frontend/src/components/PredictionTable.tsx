@@ -2,7 +2,12 @@
 
 import { useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { fetchPredictions, scorePredictions, Prediction } from "@/lib/api";
+import {
+  fetchPredictions,
+  followJob,
+  startPredictionScoringJob,
+  Prediction,
+} from "@/lib/api";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
@@ -32,9 +37,18 @@ export function PredictionTable() {
   });
 
   const scoreMutation = useMutation({
-    mutationFn: scorePredictions,
-    onSuccess: (response) => {
-      setScoredData(response.predictions);
+    mutationFn: async () => {
+      const job = await startPredictionScoringJob();
+      // Show each prediction's status as soon as it is scored
+      await followJob<Prediction>(job, (scored) =>
+        setScoredData((current) =>
+          (current || data?.predictions || []).map((p) =>
+            p.id === scored.id ? scored : p
+          )
+        )
+      );
+    },
+    onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["predictions"] });
     },
   });
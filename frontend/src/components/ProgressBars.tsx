@@ -1,11 +1,40 @@
 "use client";
 
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { fetchProgress, analyzeProgress } from "@/lib/api";
+import {
+  fetchProgress,
+  fetchProgressHistory,
+  followJob,
+  startProgressAnalysisJob,
+  ProgressHistoryPoint,
+  ProgressItem,
+  ProgressList,
+} from "@/lib/api";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Progress } from "@/components/ui/progress";
 import { Button } from "@/components/ui/button";
 
+function Sparkline({ points }: { points: ProgressHistoryPoint[] }) {
+  if (points.length < 2) return null;
+
+  const width = 80;
+  const height = 20;
+  const step = width / (points.length - 1);
+  const path = points
+    .map((p, i) => {
+      const x = (i * step).toFixed(1);
+      const y = (height - (p.progress / 100) * height).toFixed(1);
+      return `${i === 0 ? "M" : "L"}${x},${y}`;
+    })
+    .join(" ");
+
+  return (
+    <svg width={width} height={height} className="text-muted-foreground" aria-hidden>
+      <path d={path} fill="none" stroke="currentColor" strokeWidth={1.5} />
+    </svg>
+  );
+}
+
 export function ProgressBars() {
   const queryClient = useQueryClient();
 
@@ -14,10 +43,26 @@ export function ProgressBars() {
     queryFn: fetchProgress,
   });
 
+  const { data: history } = useQuery({
+    queryKey: ["progress-history"],
+    queryFn: () => fetchProgressHistory("daily"),
+  });
+
   const analyzeMutation = useMutation({
-    mutationFn: analyzeProgress,
+    mutationFn: async () => {
+      const job = await startProgressAnalysisJob();
+      // Replace each category's bar as soon as its analysis lands
+      await followJob<ProgressItem>(job, (item) =>
+        queryClient.setQueryData<ProgressList>(["progress"], (old) =>
+          old
+            ? { items: old.items.map((i) => (i.title === item.title ? item : i)) }
+            : old
+        )
+      );
+    },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["progress"] });
+      queryClient.invalidateQueries({ queryKey: ["progress-history"] });
       queryClient.invalidateQueries({ queryKey: ["alerts"] });
     },
   });
@@ -52,7 +97,14 @@ export function ProgressBars() {
           <div key={item.title} className="space-y-1">
             <div className="flex justify-between text-sm">
               <span className="font-medium">{item.title}</span>
-              <span className="text-muted-foreground">{item.progress}%</span>
+              <span className="flex items-center gap-2 text-muted-foreground">
+                <Sparkline
+                  points={
+                    history?.series.find((s) => s.category === item.title)?.points ?? []
+                  }
+                />
+                {item.progress}%
+              </span>
             </div>
             <Progress
               value={item.progress}
@@ -6,10 +6,12 @@ export interface Prediction {
   prediction: string;
   result: string;
   news_match: string;
+  category?: string | null;
 }
 
 export interface PredictionList {
   predictions: Prediction[];
+  next_cursor?: string | null;
 }
 
 export interface ScoreResponse {
@@ -33,9 +35,34 @@ export interface ProgressList {
   items: ProgressItem[];
 }
 
+export interface ProgressHistoryPoint {
+  timestamp: string;
+  progress: number;
+  samples: number;
+}
+
+export interface ProgressHistorySeries {
+  category: string;
+  points: ProgressHistoryPoint[];
+}
+
+export interface ProgressHistory {
+  bucket: "raw" | "daily" | "weekly";
+  start: string;
+  end: string;
+  series: ProgressHistorySeries[];
+}
+
+export interface ActiveAlert {
+  rule: string;
+  message: string;
+  since: string;
+}
+
 export interface AlertStatus {
   triggered: boolean;
   reason: string;
+  alerts?: ActiveAlert[];
 }
 
 export interface GeopoliticalArticle {
@@ -50,6 +77,14 @@ export interface GeopoliticalFeed {
   articles: GeopoliticalArticle[];
 }
 
+export interface JobStatus {
+  job_id: string;
+  kind: string;
+  status: "running" | "completed" | "failed";
+  completed_items: number;
+  events_url: string;
+}
+
 export async function fetchPredictions(): Promise<PredictionList> {
   const res = await fetch(`${API_URL}/api/predictions`);
   if (!res.ok) throw new Error("Failed to fetch predictions");
@@ -64,6 +99,14 @@ export async function scorePredictions(): Promise<ScoreResponse> {
   return res.json();
 }
 
+export async function startPredictionScoringJob(): Promise<JobStatus> {
+  const res = await fetch(`${API_URL}/api/predictions/score/jobs`, {
+    method: "POST",
+  });
+  if (!res.ok) throw new Error("Failed to start prediction scoring");
+  return res.json();
+}
+
 export async function fetchProgress(): Promise<ProgressList> {
   const res = await fetch(`${API_URL}/api/progress`);
   if (!res.ok) throw new Error("Failed to fetch progress");
@@ -78,12 +121,60 @@ export async function analyzeProgress(): Promise<ProgressList> {
   return res.json();
 }
 
+export async function startProgressAnalysisJob(): Promise<JobStatus> {
+  const res = await fetch(`${API_URL}/api/progress/analyze/jobs`, {
+    method: "POST",
+  });
+  if (!res.ok) throw new Error("Failed to start progress analysis");
+  return res.json();
+}
+
+// Calls onItem for each result streamed by a background job; resolves when the job finishes
+// and rejects when it fails.
+export function followJob<T>(job: JobStatus, onItem: (item: T) => void): Promise<void> {
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_URL}/api/jobs/${job.job_id}/events`);
+    source.addEventListener("item", (e) => onItem(JSON.parse((e as MessageEvent).data)));
+    source.addEventListener("done", () => {
+      source.close();
+      resolve();
+    });
+    source.addEventListener("failed", (e) => {
+      source.close();
+      reject(new Error(JSON.parse((e as MessageEvent).data).detail));
+    });
+    // A dropped connection reconnects on its own and resumes after the last event id;
+    // only give up once the browser stops retrying (e.g. the job no longer exists)
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Job stream failed"));
+      }
+    };
+  });
+}
+
+export async function fetchProgressHistory(
+  bucket: ProgressHistory["bucket"] = "daily"
+): Promise<ProgressHistory> {
+  const res = await fetch(`${API_URL}/api/progress/history?bucket=${bucket}`);
+  if (!res.ok) throw new Error("Failed to fetch progress history");
+  return res.json();
+}
+
 export async function fetchAlerts(): Promise<AlertStatus> {
   const res = await fetch(`${API_URL}/api/alerts`);
   if (!res.ok) throw new Error("Failed to fetch alerts");
   return res.json();
 }
 
+export function subscribeAlerts(onStatus: (status: AlertStatus) => void): () => void {
+  const source = new EventSource(`${API_URL}/api/alerts/events`);
+  source.addEventListener("status", (e) => onStatus(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener("alert", (e) => onStatus(JSON.parse((e as MessageEvent).data).status));
+  // EventSource reconnects on its own and resumes after the last alert id
+  return () => source.close();
+}
+
 export async function fetchGeopolitical(): Promise<GeopoliticalFeed> {
   const res = await fetch(`${API_URL}/api/geopolitical`);
   if (!res.ok) throw new Error("Failed to fetch geopolitical feed");